@@ -1,8 +1,18 @@
 """Simple configuration management for RAG Obsidian system."""
 
+import pickle
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+# Parsed configs keyed by (resolved path, mtime in ns)
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
@@ -25,40 +35,86 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
             f"❌ {config_path} not found. Please create it from config.yaml.example"
         )
     
+    config_mtime = config_file.stat().st_mtime_ns
+    cache_key = (str(config_file.resolve()), config_mtime)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Pickled raw YAML written by a previous run, valid while not older than the YAML.
+    # Defaults are re-applied on every load so newly added settings are never lost.
+    sidecar = config_file.with_suffix('.yaml.pkl')
+    config = None
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        
-        # Validate required keys
-        required_keys = ['paths', 'models']
-        for key in required_keys:
-            if key not in config:
-                raise ValueError(f"❌ Missing required configuration section: {key}")
-        
-        # Validate required paths
-        if 'vault_path' not in config['paths']:
-            raise ValueError("❌ Missing required path: vault_path")
-        
-        # Set defaults
-        config.setdefault('search', {})
-        config['search'].setdefault('max_rdbms_results', 100)
-        config['search'].setdefault('content_preview_length', 1000)
-        
-        config.setdefault('processing', {})
-        config['processing'].setdefault('file_extensions', ['.md'])
-        config['processing'].setdefault('recursive', True)
-        config['processing'].setdefault('max_file_size_mb', 10)
-        
-        # Set metadata DB path default
-        config['paths'].setdefault('metadata_db_path', './obsidian_metadata.db')
-        
-        # Set model defaults
-        config['models'].setdefault('llm_timeout', 120.0)
-        
-        return config
+        if sidecar.stat().st_mtime_ns >= config_mtime:
+            with open(sidecar, 'rb') as f:
+                config = pickle.load(f)
+            if not isinstance(config, dict):
+                config = None
+    except Exception:
+        config = None
+    
+    if config is None:
+        try:
+            with open(config_file, 'r') as f:
+                config = yaml.load(f, Loader=_Loader)
+        except yaml.YAMLError as e:
+            raise ValueError(f"❌ Error parsing {config_path}: {e}")
         
-    except yaml.YAMLError as e:
-        raise ValueError(f"❌ Error parsing {config_path}: {e}")
+        if isinstance(config, dict):
+            try:
+                with open(sidecar, 'wb') as f:
+                    pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass
+    
+    _apply_defaults(config)
+    _CONFIG_CACHE[cache_key] = config
+    return config
+
+
+def _apply_defaults(config: Dict[str, Any]) -> None:
+    """Validate required keys and fill in defaults in place.
+    
+    Raises:
+        ValueError: If required sections or paths are missing
+    """
+    if not isinstance(config, dict):
+        raise ValueError("❌ Configuration must be a mapping")
+    
+    # Validate required keys
+    required_keys = ['paths', 'models']
+    for key in required_keys:
+        if key not in config:
+            raise ValueError(f"❌ Missing required configuration section: {key}")
+    
+    # Validate required paths
+    if 'vault_path' not in config['paths']:
+        raise ValueError("❌ Missing required path: vault_path")
+    
+    # Set defaults
+    config.setdefault('search', {})
+    config['search'].setdefault('max_rdbms_results', 100)
+    config['search'].setdefault('content_preview_length', 1000)
+    
+    config.setdefault('cache', {})
+    config['cache'].setdefault('enabled', True)
+    config['cache'].setdefault('llm_response_max_entries', 512)
+    config['cache'].setdefault('llm_response_ttl_seconds', 86400)
+    config['cache'].setdefault('semantic_threshold', 0.98)
+    config['cache'].setdefault('semantic_max_entries', 256)
+    
+    config.setdefault('processing', {})
+    config['processing'].setdefault('file_extensions', ['.md'])
+    config['processing'].setdefault('recursive', True)
+    config['processing'].setdefault('max_file_size_mb', 10)
+    config['processing'].setdefault('load_workers', 0)
+    
+    # Set metadata DB path default
+    config['paths'].setdefault('metadata_db_path', './obsidian_metadata.db')
+    
+    # Set model defaults
+    config['models'].setdefault('llm_timeout', 120.0)
 
 
 def get_vault_path(config: Dict[str, Any]) -> str:
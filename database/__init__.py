@@ -1,5 +1,6 @@
 """Database layer for RAG Obsidian system."""
 
+from .answer_cache import AnswerCache
 from .metadata_db import MetadataDatabase
 
-__all__ = ['MetadataDatabase']
+__all__ = ['AnswerCache', 'MetadataDatabase']
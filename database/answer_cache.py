@@ -0,0 +1,152 @@
+"""SQLite-backed cache of generated answers."""
+
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from database.metadata_db import MetadataDatabase
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerCache:
+    """Persistent LLM answer store in the metadata database file.
+    
+    Implements the get/set backend interface of services.llm_cache.LLMCache, so
+    cached answers survive restarts. Reads use the metadata database's reader
+    connections and writes go through its single writer. Rows past their TTL
+    are ignored and purged on open; beyond max_entries the least recently used
+    rows are dropped periodically.
+    """
+    
+    _SQL_CREATE_TABLE = '''
+        CREATE TABLE IF NOT EXISTS llm_answer_cache (
+            prompt_sha TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            ttl_secs INTEGER NOT NULL,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            last_used_at REAL NOT NULL
+        )
+    '''
+    
+    _SQL_CREATE_INDEX = '''
+        CREATE INDEX IF NOT EXISTS idx_llm_answer_cache_last_used
+        ON llm_answer_cache(last_used_at)
+    '''
+    
+    # ttl_secs = 0 means the entry never expires
+    _SQL_GET = '''
+        SELECT response FROM llm_answer_cache
+        WHERE prompt_sha = ? AND (ttl_secs = 0 OR created_at + ttl_secs > ?)
+    '''
+    
+    _SQL_TOUCH = '''
+        UPDATE llm_answer_cache SET hit_count = hit_count + ?, last_used_at = MAX(last_used_at, ?)
+        WHERE prompt_sha = ?
+    '''
+    
+    _SQL_PUT = '''
+        INSERT OR REPLACE INTO llm_answer_cache
+        (prompt_sha, response, created_at, ttl_secs, hit_count, last_used_at)
+        VALUES (?, ?, ?, ?, 0, ?)
+    '''
+    
+    _SQL_PRUNE = '''
+        DELETE FROM llm_answer_cache WHERE prompt_sha IN (
+            SELECT prompt_sha FROM llm_answer_cache
+            ORDER BY last_used_at DESC
+            LIMIT -1 OFFSET ?
+        )
+    '''
+    
+    _SQL_PURGE_EXPIRED = '''
+        DELETE FROM llm_answer_cache WHERE ttl_secs > 0 AND created_at + ttl_secs <= ?
+    '''
+    
+    # Hit counts and last-use times are buffered and written in one batch
+    # after this many hits (or on the next store, stats() or close())
+    TOUCH_FLUSH_EVERY = 32
+    
+    # Entries beyond max_entries are pruned after this many stores
+    PRUNE_EVERY = 32
+    
+    def __init__(self, metadata_db: MetadataDatabase, max_entries: int = 512):
+        """Create the cache table in the metadata database if needed.
+        
+        Args:
+            metadata_db: Metadata database whose writer and reader connections are shared
+            max_entries: Maximum number of cached answers
+        """
+        self.metadata_db = metadata_db
+        self.max_entries = max_entries
+        
+        # prompt hash -> (hits since last flush, last use time)
+        self._pending_touches: Dict[str, Tuple[int, float]] = {}
+        self._pending_hits = 0
+        self._sets_since_prune = 0
+        self._lock = threading.Lock()
+        
+        with self.metadata_db.transaction() as conn:
+            conn.execute(self._SQL_CREATE_TABLE)
+            conn.execute(self._SQL_CREATE_INDEX)
+            conn.execute(self._SQL_PURGE_EXPIRED, (int(time.time()),))
+            conn.execute(self._SQL_PRUNE, (self.max_entries,))
+    
+    def close(self):
+        """Write buffered hit counts; the connections belong to the metadata database."""
+        self._flush_touches()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached answer for a prompt hash, or None if missing or expired."""
+        now = time.time()
+        row = self.metadata_db.reader().execute(self._SQL_GET, (key, now)).fetchone()
+        if row is None:
+            return None
+        
+        # Hits are recorded in memory so reads never take the write lock
+        with self._lock:
+            hits, _ = self._pending_touches.get(key, (0, now))
+            self._pending_touches[key] = (hits + 1, now)
+            self._pending_hits += 1
+            flush = self._pending_hits >= self.TOUCH_FLUSH_EVERY
+        if flush:
+            self._flush_touches()
+        return row[0]
+    
+    def set(self, key: str, value: str, ttl: int):
+        """Store an answer under a prompt hash, evicting the least recently used beyond max_entries."""
+        now = time.time()
+        with self._lock:
+            self._sets_since_prune += 1
+            prune = self._sets_since_prune >= self.PRUNE_EVERY
+            if prune:
+                self._sets_since_prune = 0
+        
+        self._flush_touches()
+        with self.metadata_db.transaction() as conn:
+            conn.execute(self._SQL_PUT, (key, value, int(now), ttl, now))
+            if prune:
+                conn.execute(self._SQL_PRUNE, (self.max_entries,))
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored answers and their total hits across runs."""
+        self._flush_touches()
+        entries, total_hits = self.metadata_db.reader().execute(
+            'SELECT COUNT(*), COALESCE(SUM(hit_count), 0) FROM llm_answer_cache'
+        ).fetchone()
+        return {'entries': entries, 'total_hits': total_hits}
+    
+    def _flush_touches(self):
+        """Write buffered hit counts and last-use times in one transaction."""
+        with self._lock:
+            if not self._pending_touches:
+                return
+            touches = [(hits, last_used, key) for key, (hits, last_used) in self._pending_touches.items()]
+            self._pending_touches.clear()
+            self._pending_hits = 0
+        
+        with self.metadata_db.transaction() as conn:
+            conn.executemany(self._SQL_TOUCH, touches)
@@ -1,9 +1,14 @@
 """SQLite metadata database operations."""
 
+import re
+import sys
+import json
 import sqlite3
 import logging
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 from contextlib import contextmanager
 
 from models.file_metadata import FileMetadata
@@ -12,10 +17,119 @@ from models.search_models import SearchResult, MatchType
 
 logger = logging.getLogger(__name__)
 
+# Date query shapes recognized by _build_date_patterns
+_RE_YM = re.compile(r'\d{4}-\d{2}$')
+_RE_YMD = re.compile(r'\d{4}-\d{2}-\d{2}$')
+_RE_Y = re.compile(r'\d{4}$')
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Convert a stored creation_time (epoch seconds) to a datetime."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Rows written before creation_time was stored as an integer
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
+
 
 class MetadataDatabase:
     """SQLite database for exact metadata matching."""
     
+    # SQL kept as constants so sqlite3's statement cache reuses prepared statements.
+    # Search queries take a {preview} column that is filled by _preview_column().
+    _SQL_UPSERT_FILE = '''
+        INSERT OR REPLACE INTO files 
+        (filename, file_path, creation_time, extracted_date, content_preview)
+        VALUES (?, ?, ?, ?, ?)
+    '''
+    
+    _SQL_DATE_SEARCH = '''
+        SELECT filename, file_path, extracted_date, creation_time, {preview}
+        FROM files 
+        WHERE EXISTS (
+            SELECT 1 FROM json_each(?) AS p
+            WHERE files.extracted_date LIKE p.value OR files.filename LIKE p.value
+        )
+        ORDER BY 
+            CASE WHEN extracted_date = ? THEN 1 
+                 WHEN extracted_date LIKE ? THEN 2 
+                 ELSE 3 END,
+            filename
+    '''
+    
+    _SQL_TAG_SEARCH = '''
+        SELECT f.filename, f.file_path, f.extracted_date, f.creation_time, {preview}
+        FROM files f
+        JOIN file_tags ft ON f.id = ft.file_id
+        JOIN tags t ON ft.tag_id = t.id
+        WHERE t.tag_name LIKE ?
+        ORDER BY f.filename
+    '''
+    
+    _SQL_FILENAME_SEARCH = '''
+        SELECT f.filename, f.file_path, f.extracted_date, f.creation_time, {preview}
+        FROM files_fts
+        JOIN files f ON f.id = files_fts.rowid
+        WHERE files_fts MATCH ?
+        ORDER BY 
+            CASE WHEN f.filename = ? THEN 1 ELSE 2 END,
+            LENGTH(f.filename)
+    '''
+    
+    _SQL_CONTENT_SEARCH = '''
+        SELECT f.filename, f.file_path, f.extracted_date, f.creation_time, {preview}
+        FROM files_fts
+        JOIN files f ON f.id = files_fts.rowid
+        WHERE files_fts MATCH ?
+        ORDER BY files_fts.rank
+    '''
+    
+    # Branches of search_multi's UNION ALL query. Each selects its branch number,
+    # match type and file id plus two sort keys reproducing the per-criterion ordering.
+    _SQL_MULTI_DATE_BRANCH = '''
+        SELECT {branch} AS branch, 'date' AS match_type, id AS file_id,
+               filename, file_path, extracted_date, creation_time, {preview},
+               CASE WHEN extracted_date = ? THEN 1 
+                    WHEN extracted_date LIKE ? THEN 2 
+                    ELSE 3 END AS sort1,
+               filename AS sort2
+        FROM files 
+        WHERE EXISTS (
+            SELECT 1 FROM json_each(?) AS p
+            WHERE files.extracted_date LIKE p.value OR files.filename LIKE p.value
+        )
+    '''
+    
+    _SQL_MULTI_TAG_BRANCH = '''
+        SELECT {branch} AS branch, 'tag' AS match_type, f.id AS file_id,
+               f.filename, f.file_path, f.extracted_date, f.creation_time, {preview},
+               0 AS sort1, f.filename AS sort2
+        FROM files f
+        JOIN file_tags ft ON f.id = ft.file_id
+        JOIN tags t ON ft.tag_id = t.id
+        WHERE t.tag_name LIKE ?
+    '''
+    
+    _SQL_MULTI_FILENAME_BRANCH = '''
+        SELECT {branch} AS branch, 'filename' AS match_type, f.id AS file_id,
+               f.filename, f.file_path, f.extracted_date, f.creation_time, {preview},
+               CASE WHEN f.filename = ? THEN 1 ELSE 2 END AS sort1,
+               LENGTH(f.filename) AS sort2
+        FROM files_fts
+        JOIN files f ON f.id = files_fts.rowid
+        WHERE files_fts MATCH ?
+    '''
+    
+    _SQL_MULTI_CONTENT_BRANCH = '''
+        SELECT {branch} AS branch, 'content' AS match_type, f.id AS file_id,
+               f.filename, f.file_path, f.extracted_date, f.creation_time, {preview},
+               files_fts.rank AS sort1, NULL AS sort2
+        FROM files_fts
+        JOIN files f ON f.id = files_fts.rowid
+        WHERE files_fts MATCH ?
+    '''
+    
     def __init__(self, db_path: str):
         """Initialize the metadata database.
         
@@ -23,30 +137,138 @@ class MetadataDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = Path(db_path)
+        
+        # Single writer connection; every write is serialized through _write_lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection(self._conn)
+        self._write_lock = threading.RLock()
+        
+        # Read-only connections, one per thread, so searches never wait on writes
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        
+        self._tag_id_cache: Dict[str, int] = {}
+        self._in_bulk = False
         self._ensure_database_exists()
+        self._load_tag_cache()
+    
+    def close(self):
+        """Close the writer and all reader connections."""
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
+        self._local = threading.local()
+        
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply performance pragmas to the writer connection."""
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA wal_autocheckpoint=1000')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        # REPLACE must fire delete triggers so the FTS index stays in sync
+        conn.execute('PRAGMA recursive_triggers=ON')
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA mmap_size=268435456')
+            conn.execute('PRAGMA cache_size=-65536')
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+    
+    def reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, for other stores sharing the database file."""
+        return self._reader()
+    
+    def transaction(self):
+        """Context manager running a write block on the shared writer connection.
+        
+        Commits on success and rolls back on error; see _txn.
+        """
+        return self._txn()
     
     def _ensure_database_exists(self):
         """Ensure database and tables exist."""
         try:
-            with self._get_connection() as conn:
+            with self._txn() as conn:
                 self._create_tables(conn)
             logger.info(f"✅ Metadata database ready: {self.db_path}")
         except Exception as e:
             logger.error(f"❌ Failed to initialize database: {e}")
             raise
     
+    def _load_tag_cache(self):
+        """Populate the tag_name -> id cache from the tags table."""
+        rows = self._conn.execute('SELECT id, tag_name FROM tags').fetchall()
+        self._tag_id_cache = {sys.intern(tag_name): tag_id for tag_id, tag_name in rows}
+    
     @contextmanager
-    def _get_connection(self):
-        """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            conn.close()
+    def _txn(self):
+        """Run a write block on the shared connection, committing on success and rolling back on error.
+        
+        Inside bulk_ingest() each block runs in a savepoint instead, so a failed
+        write is undone without discarding the rest of the bulk transaction.
+        """
+        with self._write_lock:
+            conn = self._conn
+            if self._in_bulk:
+                conn.execute('SAVEPOINT write_block')
+            try:
+                yield conn
+                if self._in_bulk:
+                    conn.execute('RELEASE write_block')
+                else:
+                    conn.commit()
+            except Exception as e:
+                if self._in_bulk:
+                    conn.execute('ROLLBACK TO write_block')
+                    conn.execute('RELEASE write_block')
+                else:
+                    conn.rollback()
+                # Tags inserted in the rolled-back transaction no longer exist
+                self._tag_id_cache.clear()
+                logger.error(f"Database error: {e}")
+                raise
+    
+    @contextmanager
+    def bulk_ingest(self):
+        """Run many writes in a single transaction with fsync disabled.
+        
+        The database is a cache of the vault and can always be rebuilt, so
+        trading crash durability for ingest speed is acceptable here.
+        """
+        with self._write_lock:
+            conn = self._conn
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute('BEGIN')
+            self._in_bulk = True
+            try:
+                yield self
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._tag_id_cache.clear()
+                raise
+            finally:
+                self._in_bulk = False
+                conn.execute('PRAGMA synchronous=NORMAL')
     
     def _create_tables(self, conn: sqlite3.Connection):
         """Create database tables."""
@@ -58,7 +280,7 @@ class MetadataDatabase:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 filename TEXT NOT NULL,
                 file_path TEXT UNIQUE NOT NULL,
-                creation_time TIMESTAMP,
+                creation_time INTEGER,
                 extracted_date TEXT,
                 content_preview TEXT
             )
@@ -87,12 +309,52 @@ class MetadataDatabase:
             'CREATE INDEX IF NOT EXISTS idx_filename ON files (filename)',
             'CREATE INDEX IF NOT EXISTS idx_extracted_date ON files (extracted_date)',
             'CREATE INDEX IF NOT EXISTS idx_creation_time ON files (creation_time)',
-            'CREATE INDEX IF NOT EXISTS idx_tags ON tags (tag_name)'
+            'CREATE INDEX IF NOT EXISTS idx_tags ON tags (tag_name)',
+            # Lets tag searches walk from matching tags to their files
+            'CREATE INDEX IF NOT EXISTS idx_file_tags_tag ON file_tags (tag_id, file_id)'
         ]
         
         for index in indexes:
             cursor.execute(index)
         
+        # Full-text index over filename and preview, kept in sync by triggers
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'files_fts'")
+        fts_exists = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                filename,
+                content_preview,
+                content='files',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        
+        triggers = [
+            '''CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+                INSERT INTO files_fts (rowid, filename, content_preview)
+                VALUES (new.id, new.filename, new.content_preview);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+                INSERT INTO files_fts (files_fts, rowid, filename, content_preview)
+                VALUES ('delete', old.id, old.filename, old.content_preview);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files BEGIN
+                INSERT INTO files_fts (files_fts, rowid, filename, content_preview)
+                VALUES ('delete', old.id, old.filename, old.content_preview);
+                INSERT INTO files_fts (rowid, filename, content_preview)
+                VALUES (new.id, new.filename, new.content_preview);
+            END'''
+        ]
+        
+        for trigger in triggers:
+            cursor.execute(trigger)
+        
+        # Index rows that predate the FTS table
+        if not fts_exists:
+            cursor.execute("INSERT INTO files_fts (files_fts) VALUES ('rebuild')")
+        
         conn.commit()
     
     def insert_file_metadata(self, metadata: FileMetadata, content_preview: str) -> bool:
@@ -106,40 +368,8 @@ class MetadataDatabase:
             True if successful, False otherwise
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Insert or replace file metadata
-                cursor.execute('''
-                    INSERT OR REPLACE INTO files 
-                    (filename, file_path, creation_time, extracted_date, content_preview)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    metadata.filename,
-                    metadata.file_path,
-                    metadata.creation_time,
-                    metadata.extracted_date,
-                    content_preview
-                ))
-                
-                file_id = cursor.lastrowid
-                
-                # Handle tags - first clear existing tags for this file
-                cursor.execute('DELETE FROM file_tags WHERE file_id = ?', (file_id,))
-                
-                # Insert new tags
-                for tag in metadata.tags:
-                    # Insert tag if doesn't exist
-                    cursor.execute('INSERT OR IGNORE INTO tags (tag_name) VALUES (?)', (tag,))
-                    
-                    # Get tag ID
-                    cursor.execute('SELECT id FROM tags WHERE tag_name = ?', (tag,))
-                    tag_id = cursor.fetchone()[0]
-                    
-                    # Link file to tag
-                    cursor.execute('INSERT INTO file_tags (file_id, tag_id) VALUES (?, ?)', (file_id, tag_id))
-                
-                conn.commit()
+            with self._txn() as conn:
+                self._insert_file_row(conn.cursor(), metadata, content_preview)
                 logger.debug(f"✅ Inserted metadata for: {metadata.filename}")
                 return True
                 
@@ -147,192 +377,339 @@ class MetadataDatabase:
             logger.error(f"❌ Error inserting metadata for {metadata.filename}: {e}")
             return False
     
-    def search_by_date(self, date_query: str) -> List[SearchResult]:
-        """Search files by date patterns.
+    def insert_many(self, items: Iterable[Tuple[FileMetadata, str]]) -> bool:
+        """Insert or update metadata for many files in a single transaction.
         
         Args:
-            date_query: Date pattern to search for
+            items: Iterable of (FileMetadata, content_preview) pairs
             
         Returns:
-            List of SearchResult objects
+            True if successful, False otherwise
         """
         try:
-            with self._get_connection() as conn:
+            with self._txn() as conn:
                 cursor = conn.cursor()
+                count = 0
+                for metadata, content_preview in items:
+                    self._insert_file_row(cursor, metadata, content_preview)
+                    count += 1
+                logger.debug(f"✅ Inserted metadata for {count} files")
+                return True
                 
-                # Build search patterns based on date format
-                patterns = self._build_date_patterns(date_query)
-                
-                results = []
-                seen_files = set()
-                
-                for pattern in patterns:
-                    cursor.execute('''
-                        SELECT filename, file_path, extracted_date, creation_time, content_preview
-                        FROM files 
-                        WHERE (extracted_date LIKE ? OR filename LIKE ?)
-                        ORDER BY 
-                            CASE WHEN extracted_date = ? THEN 1 
-                                 WHEN extracted_date LIKE ? THEN 2 
-                                 ELSE 3 END,
-                            filename
-                    ''', (pattern, pattern, date_query, f"{date_query}%"))
-                    
-                    for row in cursor.fetchall():
-                        if row[1] not in seen_files:  # file_path not seen
-                            seen_files.add(row[1])
-                            results.append(SearchResult(
-                                filename=row[0],
-                                file_path=row[1],
-                                extracted_date=row[2],
-                                creation_time=row[3],
-                                content_preview=row[4],
-                                match_type=MatchType.DATE
-                            ))
-                
-                logger.debug(f"📅 Date search '{date_query}': {len(results)} results")
-                return results
-                
+        except Exception as e:
+            logger.error(f"❌ Error inserting metadata batch: {e}")
+            return False
+    
+    def _insert_file_row(self, cursor: sqlite3.Cursor, metadata: FileMetadata, content_preview: str):
+        """Insert one file row and its tag links without committing."""
+        # Insert or replace file metadata
+        cursor.execute(self._SQL_UPSERT_FILE, (
+            metadata.filename,
+            metadata.file_path,
+            int(metadata.creation_time.timestamp()),
+            metadata.extracted_date,
+            content_preview
+        ))
+        
+        file_id = cursor.lastrowid
+        
+        # Handle tags - first clear existing tags for this file
+        cursor.execute('DELETE FROM file_tags WHERE file_id = ?', (file_id,))
+        
+        if not metadata.tags:
+            return
+        
+        tags = list(dict.fromkeys(sys.intern(tag) for tag in metadata.tags))
+        missing = [tag for tag in tags if tag not in self._tag_id_cache]
+        
+        if missing:
+            # Insert unseen tags, then resolve their IDs in one query
+            cursor.executemany('INSERT OR IGNORE INTO tags (tag_name) VALUES (?)', [(tag,) for tag in missing])
+            placeholders = ','.join('?' * len(missing))
+            cursor.execute(f'SELECT id, tag_name FROM tags WHERE tag_name IN ({placeholders})', missing)
+            for tag_id, tag_name in cursor.fetchall():
+                self._tag_id_cache[sys.intern(tag_name)] = tag_id
+        
+        # Link file to tags
+        cursor.executemany(
+            'INSERT INTO file_tags (file_id, tag_id) VALUES (?, ?)',
+            [(file_id, self._tag_id_cache[tag]) for tag in tags]
+        )
+    
+    def search_by_date(self, date_query: str, include_preview: bool = False) -> Iterator[SearchResult]:
+        """Search files by date patterns.
+        
+        Args:
+            date_query: Date pattern to search for
+            include_preview: Whether to fetch the content_preview column
+            
+        Yields:
+            SearchResult objects, fetched from the cursor in batches
+        """
+        try:
+            # Build search patterns based on date format
+            patterns = self._build_date_patterns(date_query)
+            
+            # One query matches every pattern; EXISTS keeps each file once
+            sql = self._SQL_DATE_SEARCH.format(preview=self._preview_column(include_preview, ''))
+            cursor = self._reader().execute(sql, (json.dumps(patterns), date_query, f"{date_query}%"))
+            
+            count = yield from self._iter_results(cursor, MatchType.DATE)
+            
+            logger.debug(f"📅 Date search '{date_query}': {count} results")
+            
         except Exception as e:
             logger.error(f"❌ Error in date search: {e}")
-            return []
     
-    def search_by_tags(self, tag_query: str) -> List[SearchResult]:
+    def search_by_tags(self, tag_query: str, include_preview: bool = False) -> Iterator[SearchResult]:
         """Search files by tags.
         
         Args:
             tag_query: Tag to search for
+            include_preview: Whether to fetch the content_preview column
             
-        Returns:
-            List of SearchResult objects
+        Yields:
+            SearchResult objects, fetched from the cursor in batches
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT f.filename, f.file_path, f.extracted_date, f.creation_time, f.content_preview
-                    FROM files f
-                    JOIN file_tags ft ON f.id = ft.file_id
-                    JOIN tags t ON ft.tag_id = t.id
-                    WHERE t.tag_name LIKE ?
-                    ORDER BY f.filename
-                ''', (f"%{tag_query}%",))
-                
-                results = []
-                for row in cursor.fetchall():
-                    results.append(SearchResult(
-                        filename=row[0],
-                        file_path=row[1],
-                        extracted_date=row[2],
-                        creation_time=row[3],
-                        content_preview=row[4],
-                        match_type=MatchType.TAG
-                    ))
-                
-                logger.debug(f"🏷️ Tag search '{tag_query}': {len(results)} results")
-                return results
-                
+            sql = self._SQL_TAG_SEARCH.format(preview=self._preview_column(include_preview))
+            cursor = self._reader().execute(sql, (f"%{tag_query}%",))
+            
+            count = yield from self._iter_results(cursor, MatchType.TAG)
+            
+            logger.debug(f"🏷️ Tag search '{tag_query}': {count} results")
+            
         except Exception as e:
             logger.error(f"❌ Error in tag search: {e}")
-            return []
     
-    def search_by_filename(self, filename_query: str) -> List[SearchResult]:
-        """Search files by filename patterns.
+    def search_by_filename(self, filename_query: str, include_preview: bool = False) -> Iterator[SearchResult]:
+        """Search files by filename terms using the full-text index.
         
         Args:
             filename_query: Filename pattern to search for
+            include_preview: Whether to fetch the content_preview column
             
-        Returns:
-            List of SearchResult objects
+        Yields:
+            SearchResult objects, fetched from the cursor in batches
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT filename, file_path, extracted_date, creation_time, content_preview
-                    FROM files 
-                    WHERE filename LIKE ?
-                    ORDER BY 
-                        CASE WHEN filename = ? THEN 1 ELSE 2 END,
-                        LENGTH(filename)
-                ''', (f"%{filename_query}%", filename_query))
-                
-                results = []
-                for row in cursor.fetchall():
-                    results.append(SearchResult(
-                        filename=row[0],
-                        file_path=row[1],
-                        extracted_date=row[2],
-                        creation_time=row[3],
-                        content_preview=row[4],
-                        match_type=MatchType.FILENAME
-                    ))
-                
-                logger.debug(f"📄 Filename search '{filename_query}': {len(results)} results")
-                return results
-                
+            sql = self._SQL_FILENAME_SEARCH.format(preview=self._preview_column(include_preview))
+            cursor = self._reader().execute(sql, (self._fts_query(filename_query, 'filename'), filename_query))
+            
+            count = yield from self._iter_results(cursor, MatchType.FILENAME)
+            
+            logger.debug(f"📄 Filename search '{filename_query}': {count} results")
+            
         except Exception as e:
             logger.error(f"❌ Error in filename search: {e}")
-            return []
     
-    def search_by_content(self, content_query: str) -> List[SearchResult]:
-        """Search files by content preview.
+    def search_by_content(self, content_query: str, include_preview: bool = False) -> Iterator[SearchResult]:
+        """Search files by content preview using the full-text index.
         
         Args:
             content_query: Content to search for
+            include_preview: Whether to fetch the content_preview column
             
-        Returns:
-            List of SearchResult objects
+        Yields:
+            SearchResult objects, fetched from the cursor in batches
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT filename, file_path, extracted_date, creation_time, content_preview
-                    FROM files 
-                    WHERE content_preview LIKE ?
-                    ORDER BY LENGTH(filename)
-                ''', (f"%{content_query}%",))
-                
-                results = []
-                for row in cursor.fetchall():
-                    results.append(SearchResult(
-                        filename=row[0],
-                        file_path=row[1],
-                        extracted_date=row[2],
-                        creation_time=row[3],
-                        content_preview=row[4],
-                        match_type=MatchType.CONTENT
-                    ))
-                
-                logger.debug(f"📝 Content search '{content_query}': {len(results)} results")
-                return results
-                
+            sql = self._SQL_CONTENT_SEARCH.format(preview=self._preview_column(include_preview))
+            cursor = self._reader().execute(sql, (self._fts_query(content_query, 'content_preview'),))
+            
+            count = yield from self._iter_results(cursor, MatchType.CONTENT)
+            
+            logger.debug(f"📝 Content search '{content_query}': {count} results")
+            
+        except Exception as e:
+            logger.error(f"❌ Error in content search: {e}")
+    
+    def search_by_content_multi(self, keywords: List[str], include_preview: bool = False) -> Iterator[SearchResult]:
+        """Search file content for any of several keywords with one full-text query.
+        
+        Files are ranked by the FTS index across all keywords, so notes matching
+        several of them come first.
+        
+        Args:
+            keywords: Content terms to search for
+            include_preview: Whether to fetch the content_preview column
+            
+        Yields:
+            SearchResult objects, fetched from the cursor in batches
+        """
+        if not keywords:
+            return
+        
+        try:
+            match = ' OR '.join(f"({self._fts_query(keyword, 'content_preview')})" for keyword in keywords)
+            sql = self._SQL_CONTENT_SEARCH.format(preview=self._preview_column(include_preview))
+            cursor = self._reader().execute(sql, (match,))
+            
+            count = yield from self._iter_results(cursor, MatchType.CONTENT)
+            
+            logger.debug(f"📝 Content search {keywords}: {count} results")
+            
         except Exception as e:
             logger.error(f"❌ Error in content search: {e}")
-            return []
+    
+    def search_multi(self, dates: List[str] = (), tags: List[str] = (), filenames: List[str] = (),
+                     keywords: List[str] = (), include_preview: bool = False) -> Iterator[SearchResult]:
+        """Run date, tag, filename and content searches for many values in one query.
+        
+        Equivalent to calling search_by_date, search_by_tags, search_by_filename
+        and search_by_content for each value in turn and chaining the results,
+        but answered by a single UNION ALL statement. Each file is returned once,
+        with the match type of its first occurrence. Files matching more kinds of
+        criteria (e.g. both a date and a tag) are ranked first.
+        
+        Args:
+            dates: Date patterns to search for
+            tags: Tags to search for
+            filenames: Filename patterns to search for
+            keywords: Content terms to search for
+            include_preview: Whether to fetch the content_preview column
+            
+        Yields:
+            SearchResult objects in per-value order, fetched from the cursor in batches
+        """
+        branches = []
+        params = []
+        
+        for date in dates:
+            preview = self._preview_column(include_preview, '')
+            branches.append(self._SQL_MULTI_DATE_BRANCH.format(branch=len(branches), preview=preview))
+            params.extend((date, f"{date}%", json.dumps(self._build_date_patterns(date))))
+        
+        preview = self._preview_column(include_preview)
+        for tag in tags:
+            branches.append(self._SQL_MULTI_TAG_BRANCH.format(branch=len(branches), preview=preview))
+            params.append(f"%{tag}%")
+        
+        for filename in filenames:
+            branches.append(self._SQL_MULTI_FILENAME_BRANCH.format(branch=len(branches), preview=preview))
+            params.extend((filename, self._fts_query(filename, 'filename')))
+        
+        for keyword in keywords:
+            branches.append(self._SQL_MULTI_CONTENT_BRANCH.format(branch=len(branches), preview=preview))
+            params.append(self._fts_query(keyword, 'content_preview'))
+        
+        if not branches:
+            return
+        
+        try:
+            # Duplicates are dropped by file id in SQL, keeping each file's first
+            # occurrence; matched_kinds counts the distinct match types per file
+            sql = f"""
+                SELECT * FROM (
+                    SELECT *,
+                           ROW_NUMBER() OVER (PARTITION BY file_id ORDER BY branch, sort1, sort2) AS occurrence,
+                           MAX(match_type = 'date') OVER by_file + MAX(match_type = 'tag') OVER by_file
+                           + MAX(match_type = 'filename') OVER by_file + MAX(match_type = 'content') OVER by_file
+                           AS matched_kinds
+                    FROM ({' UNION ALL '.join(branches)})
+                    WINDOW by_file AS (PARTITION BY file_id)
+                )
+                WHERE occurrence = 1
+                ORDER BY matched_kinds DESC, branch, sort1, sort2
+            """
+            cursor = self._reader().execute(sql, params)
+            
+            count = yield from self._iter_results(cursor)
+            
+            logger.debug(f"🔎 Multi search ({len(branches)} criteria): {count} results")
+            
+        except Exception as e:
+            logger.error(f"❌ Error in multi search: {e}")
+    
+    def get_previews(self, file_paths: List[str]) -> Dict[str, str]:
+        """Fetch the stored content previews for many files in one query.
+        
+        Args:
+            file_paths: Paths of the files
+            
+        Returns:
+            Mapping of file path to content preview; files not indexed are omitted
+        """
+        if not file_paths:
+            return {}
+        
+        try:
+            rows = self._reader().execute(
+                'SELECT file_path, content_preview FROM files '
+                'WHERE file_path IN (SELECT value FROM json_each(?))',
+                (json.dumps(file_paths),)
+            ).fetchall()
+            return {row['file_path']: row['content_preview'] for row in rows}
+        except Exception as e:
+            logger.error(f"❌ Error fetching previews for {len(file_paths)} files: {e}")
+            return {}
+    
+    @staticmethod
+    def _preview_column(include_preview: bool, alias: str = 'f.') -> str:
+        """Projection for the preview column; an empty string unless requested."""
+        return f"{alias}content_preview" if include_preview else "'' AS content_preview"
+    
+    @staticmethod
+    def _iter_results(cursor: sqlite3.Cursor, match_type: Optional[MatchType] = None) -> Iterator[SearchResult]:
+        """Yield search results from a cursor without materializing all rows.
+        
+        Args:
+            cursor: Cursor positioned on a search query
+            match_type: Match type to tag each result with; None reads it from
+                the row's match_type column
+            
+        Yields:
+            SearchResult objects
+            
+        Returns:
+            Number of results yielded (as the generator's return value)
+        """
+        count = 0
+        while True:
+            batch = cursor.fetchmany(256)
+            if not batch:
+                return count
+            for row in batch:
+                yield SearchResult(
+                    filename=row['filename'],
+                    file_path=row['file_path'],
+                    extracted_date=row['extracted_date'],
+                    creation_time=_to_datetime(row['creation_time']),
+                    content_preview=row['content_preview'],
+                    match_type=match_type or MatchType(row['match_type'])
+                )
+            count += len(batch)
+    
+    @staticmethod
+    def _fts_query(text: str, column: str) -> str:
+        """Build an FTS5 prefix-phrase query for one column.
+        
+        Args:
+            text: Raw search text
+            column: FTS column to restrict the match to
+            
+        Returns:
+            FTS5 MATCH expression
+        """
+        escaped = text.strip().replace('"', '""')
+        return f'{column} : "{escaped}"*'
     
     def _build_date_patterns(self, date_query: str) -> List[str]:
         """Build search patterns for different date formats."""
-        import re
-        
         patterns = []
         
-        if re.match(r'\d{4}-\d{2}$', date_query):  # YYYY-MM format
+        if _RE_YM.match(date_query):  # YYYY-MM format
             patterns.extend([
                 f"{date_query}%",  # 2025-01-XX
                 f"{date_query}",   # exact match
                 date_query.replace('-', ''),  # 202501
             ])
-        elif re.match(r'\d{4}-\d{2}-\d{2}$', date_query):  # Full date
+        elif _RE_YMD.match(date_query):  # Full date
             patterns.extend([
                 date_query,
                 f"{date_query}%",
             ])
-        elif re.match(r'\d{4}$', date_query):  # Year only
+        elif _RE_Y.match(date_query):  # Year only
             patterns.extend([
                 f"{date_query}-%",
                 f"{date_query}",
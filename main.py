@@ -6,12 +6,11 @@ import time
 from typing import Optional
 
 import typer
-from llama_index.core.settings import Settings
-from llama_index.llms.ollama import Ollama
 
 from config.settings import load_config
-from services.rag_service import RAGService
-from services.document_enricher import DocumentEnricher
+
+# LLM and service modules are imported inside the commands that use them
+# so `--help` and each command only pay for their own dependency graph.
 
 # Create the main typer app
 app = typer.Typer(
@@ -36,10 +35,19 @@ def setup_logging(debug: bool = False):
 
 def configure_llm(config):
     """Configure LlamaIndex LLM."""
+    from llama_index.core.settings import Settings
+    from llama_index.llms.ollama import Ollama
+    
     Settings.llm = Ollama(
         model=config['models']['llm_model'],
         request_timeout=config['models']['llm_timeout']
     )
+    
+    # Optional: enables the semantic query cache
+    if config['models'].get('embed_model'):
+        from llama_index.embeddings.ollama import OllamaEmbedding
+        
+        Settings.embed_model = OllamaEmbedding(model_name=config['models']['embed_model'])
 
 
 def interactive_mode(rag_service):
@@ -59,6 +67,9 @@ def interactive_mode(rag_service):
             if query.lower() == 'stats':
                 stats = rag_service.get_stats()
                 print(f"\\n📊 {stats['documents_loaded']} documents loaded")
+                answer_cache = stats['answer_cache']
+                print(f"💾 Answer cache: {answer_cache['hits']} hits, {answer_cache['misses']} misses, "
+                      f"{answer_cache['entries']} stored")
                 continue
             
             # Search and respond
@@ -76,11 +87,15 @@ def interactive_mode(rag_service):
 def enrich(
     force_update: bool = typer.Option(False, "--force-update", help="Force update existing frontmatter"),
     max_files: Optional[int] = typer.Option(None, "--max-files", help="Maximum number of files to process (for testing)"),
-    max_workers: int = typer.Option(16, "--max-workers", help="Maximum number of worker threads for parallel processing"),
+    max_workers: int = typer.Option(16, "--max-workers", help="Maximum number of concurrent LLM requests for parallel processing"),
+    batch_size: int = typer.Option(8, "--batch-size", help="Number of documents sent to the LLM in a single prompt"),
+    rpm: Optional[int] = typer.Option(None, "--rpm", help="Limit LLM requests per minute in parallel mode"),
     sequential: bool = typer.Option(False, "--sequential", help="Use sequential processing instead of parallel"),
     debug: bool = typer.Option(False, "--debug", help="Enable debug logging")
 ):
     """Enrich Obsidian documents with LLM-generated frontmatter."""
+    from services.document_enricher import DocumentEnricher
+    
     setup_logging(debug)
     
     typer.echo("🚀 RAG Obsidian - Document Enrichment Mode")
@@ -92,7 +107,7 @@ def enrich(
         configure_llm(config)
         
         # Initialize enricher with worker configuration
-        enricher = DocumentEnricher(max_workers=max_workers)
+        enricher = DocumentEnricher(max_workers=max_workers, batch_size=batch_size, requests_per_minute=rpm)
         
         # Get vault path from config
         vault_path = config['paths']['vault_path']
@@ -107,7 +122,7 @@ def enrich(
         if sequential:
             typer.echo("📝 Sequential processing enabled")
         else:
-            typer.echo(f"⚡ Parallel processing with {max_workers} workers")
+            typer.echo(f"⚡ Parallel processing with {max_workers} workers, {batch_size} documents per LLM call")
         
         typer.echo("-" * 50)
         
@@ -139,9 +154,12 @@ def enrich(
 
 @app.command()
 def rag(
-    debug: bool = typer.Option(False, "--debug", help="Enable debug logging")
+    debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable cached query parses, results and answers")
 ):
     """Start interactive RAG search mode."""
+    from services.rag_service import RAGService
+    
     setup_logging(debug)
     
     try:
@@ -150,15 +168,18 @@ def rag(
         configure_llm(config)
         
         # Initialize RAG service
-        rag_service = RAGService(config)
-        typer.echo("🚀 Loading documents...")
-        
-        if not rag_service.load_and_process_documents():
-            typer.echo("❌ Failed to load documents")
-            raise typer.Exit(1)
-        
-        # Start interactive mode
-        interactive_mode(rag_service)
+        rag_service = RAGService(config, use_cache=not no_cache)
+        try:
+            typer.echo("🚀 Loading documents...")
+            
+            if not rag_service.load_and_process_documents():
+                typer.echo("❌ Failed to load documents")
+                raise typer.Exit(1)
+            
+            # Start interactive mode
+            interactive_mode(rag_service)
+        finally:
+            rag_service.close()
         
     except Exception as e:
         typer.echo(f"❌ Error in RAG mode: {e}")
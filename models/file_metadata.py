@@ -1,12 +1,18 @@
 """File metadata models."""
 
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Tuple
 
 
-@dataclass
-class FileMetadata:
+class _TagLookup:
+    """Holds the lazily built lowercase tag set outside the dataclass fields."""
+    __slots__ = ('_tags_lower',)
+
+
+@dataclass(slots=True)
+class FileMetadata(_TagLookup):
     """Simplified file metadata for RDBMS storage."""
     filename: str
     file_path: str
@@ -14,6 +20,10 @@ class FileMetadata:
     extracted_date: Optional[str] = None
     tags: List[str] = field(default_factory=list)
     
+    # Serialized keys, read in one C-level call by to_dict
+    _DICT_KEYS = ('filename', 'file_path', 'creation_time', 'extracted_date', 'tags')
+    _dict_values = operator.attrgetter(*_DICT_KEYS)
+    
     def __post_init__(self):
         """Post-initialization validation."""
         if self.tags is None:
@@ -25,15 +35,16 @@ class FileMetadata:
         return self.extracted_date is not None
     
     def has_tag(self, tag: str) -> bool:
-        """Check if file has a specific tag."""
-        return tag.lower() in [t.lower() for t in self.tags]
+        """Check if file has a specific tag (case-insensitive)."""
+        # Built on first use; rebuilt if tags was reassigned or changed length since
+        cached: Optional[Tuple[List[str], int, FrozenSet[str]]] = getattr(self, '_tags_lower', None)
+        if cached is None or cached[0] is not self.tags or cached[1] != len(self.tags):
+            cached = (self.tags, len(self.tags), frozenset(t.lower() for t in self.tags))
+            self._tags_lower = cached
+        return tag.lower() in cached[2]
     
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return {
-            'filename': self.filename,
-            'file_path': self.file_path,
-            'creation_time': self.creation_time.isoformat(),
-            'extracted_date': self.extracted_date,
-            'tags': self.tags
-        }
\ No newline at end of file
+        data = dict(zip(self._DICT_KEYS, self._dict_values(self)))
+        data['creation_time'] = self.creation_time.isoformat()
+        return data
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Search-related data models."""
 
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Optional, Any
@@ -20,7 +21,7 @@ class MatchType(Enum):
     CONTENT = "content"
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchQuery:
     """Represents a user search query."""
     raw_query: str
@@ -35,7 +36,7 @@ class SearchQuery:
         return bool(self.dates or self.tags or self.filenames)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Represents a search result."""
     filename: str
@@ -46,20 +47,21 @@ class SearchResult:
     content: str = ""
     match_type: MatchType = MatchType.CONTENT
     
+    # Serialized keys, read in one C-level call by to_dict
+    _DICT_KEYS = ('filename', 'file_path', 'extracted_date', 'creation_time',
+                  'content_preview', 'content', 'match_type')
+    _dict_values = operator.attrgetter(*_DICT_KEYS)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        return {
-            'filename': self.filename,
-            'file_path': self.file_path,
-            'extracted_date': self.extracted_date,
-            'creation_time': self.creation_time.isoformat() if self.creation_time else None,
-            'content_preview': self.content_preview,
-            'content': self.content,
-            'match_type': self.match_type.value
-        }
+        data = dict(zip(self._DICT_KEYS, self._dict_values(self)))
+        if self.creation_time:
+            data['creation_time'] = self.creation_time.isoformat()
+        data['match_type'] = self.match_type.value
+        return data
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryAnalysis:
     """Analysis results from query parsing."""
     original_query: str
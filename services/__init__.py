@@ -1,7 +1,22 @@
 """Services layer for RAG Obsidian system."""
 
-from .document_processor import DocumentProcessor
-from .query_parser import parse_query_with_llm
-from .rag_service import RAGService
+from importlib import import_module
 
-__all__ = ['DocumentProcessor', 'parse_query_with_llm', 'RAGService']
+# Services are resolved lazily so importing one submodule (e.g. the enricher)
+# does not pull in the others and their dependencies.
+_EXPORTS = {
+    'DocumentProcessor': '.document_processor',
+    'parse_query_with_llm': '.query_parser',
+    'RAGService': '.rag_service',
+    'complete_multi': '.llm_pipeline',
+    'LLMCache': '.llm_cache',
+    'get_llm_cache': '.llm_cache',
+}
+
+__all__ = ['DocumentProcessor', 'parse_query_with_llm', 'RAGService', 'complete_multi', 'LLMCache', 'get_llm_cache']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,81 +1,308 @@
 """Document enrichment service for adding LLM-generated frontmatter to Obsidian documents."""
 
 import os
+import json
+import time
+import asyncio
 import yaml
 import logging
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Union
 from tqdm import tqdm
 from threading import Lock
+from itertools import islice, chain, repeat
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from llama_index.core.settings import Settings
+from pydantic import BaseModel, Field
 
 from services.document_processor import DocumentProcessor
+from services.frontmatter_index import FrontmatterIndex
+from services.llm_cache import get_llm_cache
+from services.llm_pipeline import structured_complete, astructured_complete
 
 logger = logging.getLogger(__name__)
 
+# Characters of each document sent to the LLM
+PREVIEW_CHARS = 2000
+
+# Upper bound on combined preview characters in one batched prompt
+BATCH_CHAR_BUDGET = 6 * PREVIEW_CHARS
+
+_FRONTMATTER_GUIDELINES = """Guidelines:
+- Make the title specific and informative
+- Keep descriptions concise but meaningful
+- Use specific, relevant tags that categorize the content
+- For daily notes, include activity-based tags like "work", "personal", "learning"
+- For technical content, include technology/topic tags
+- Avoid generic tags like "note" or "document\""""
+
+# Fixed instructions go first and only the document text is appended, so
+# inference servers with prefix caching can reuse the shared prefix
+_FRONTMATTER_PROMPT_PREFIX = f"""Analyze the document content below and generate YAML frontmatter metadata.
+
+Generate a JSON object with the following fields:
+- "title": A concise, descriptive title for the document (max 60 chars)
+- "description": A brief description summarizing the content (1-2 sentences)
+- "tags": An array of relevant tags (3-8 tags, use lowercase with hyphens)
+
+{_FRONTMATTER_GUIDELINES}
+
+Return ONLY a valid JSON object with these exact field names.
+
+Document content:
+"""
+
+_FRONTMATTER_BATCH_PROMPT_PREFIX = f"""Analyze each of the documents below and generate YAML frontmatter metadata for each one.
+
+For every document, generate an object with the following fields:
+- "id": The document number given below
+- "title": A concise, descriptive title for the document (max 60 chars)
+- "description": A brief description summarizing the content (1-2 sentences)
+- "tags": An array of relevant tags (3-8 tags, use lowercase with hyphens)
+
+{_FRONTMATTER_GUIDELINES}
+
+Return ONLY a valid JSON object of the form {{"results": [{{"id": 1, "title": "...", "description": "...", "tags": ["..."]}}]}} with exactly one entry per document.
+
+"""
+
+
+def _classify_file(file_path: str, force_update: bool) -> Tuple[Optional[str], bool, int, Optional[Tuple[str, Dict]]]:
+    """Decide whether a file needs an LLM call.
+    
+    Module-level so it can run in a ProcessPoolExecutor worker.
+    
+    Returns:
+        Tuple of (status, has_frontmatter, mtime_ns, parsed) where status is "skipped"
+        or "failed" for a file that needs no LLM call, else None. For files that need
+        the LLM, parsed is (content_without_frontmatter, existing_frontmatter) so the
+        file is not read again.
+    """
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        content = Path(file_path).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return "failed", False, 0, None
+    
+    if not content.strip():
+        return "skipped", False, mtime_ns, None
+    
+    frontmatter, content_without_frontmatter = DocumentProcessor.parse_yaml_frontmatter(content)
+    if frontmatter and not force_update:
+        return "skipped", True, mtime_ns, None
+    
+    return None, bool(frontmatter), mtime_ns, (content_without_frontmatter, frontmatter)
+
+
+class FrontmatterFields(BaseModel):
+    """Structured output schema for LLM-generated frontmatter."""
+    title: str
+    description: str
+    tags: List[str] = Field(default_factory=list)
+
+
+class RateLimiter:
+    """Token bucket that spaces async LLM requests to a requests-per-minute budget."""
+    
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm
+        # Allow up to one second's worth of requests in a burst
+        self.capacity = max(1, rpm // 60)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until another request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.interval)
+
 
 class DocumentEnricher:
     """Service for enriching Obsidian documents with LLM-generated frontmatter."""
     
-    def __init__(self, max_workers: int = 16):
+    # Files classified per process-pool round while the vault walk continues
+    CLASSIFY_CHUNK_SIZE = 256
+    
+    def __init__(self, max_workers: int = 16, batch_size: int = 8, requests_per_minute: Optional[int] = None):
         """Initialize the document enricher.
         
         Args:
-            max_workers: Maximum number of worker threads for parallel processing
+            max_workers: Maximum number of concurrent LLM requests for parallel processing
+            batch_size: Number of documents sent to the LLM in one prompt (1 disables batching)
+            requests_per_minute: Rate limit for LLM requests in parallel mode (None for unlimited)
         """
-        self.document_processor = DocumentProcessor()
         self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
+        self.requests_per_minute = requests_per_minute
+        # Set while enrich_directory runs; lets unchanged, already-enriched files skip the read
+        self.frontmatter_index: Optional[FrontmatterIndex] = None
         self._stats_lock = Lock()
     
-    def enrich_file(self, file_path: str, force_update: bool = False) -> Dict[str, Any]:
-        """Enrich a single file and return a status dictionary."""
+    def enrich_file(self, file_path: Union[str, os.DirEntry], force_update: bool = False,
+                    prestat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """Enrich a single file and return a status dictionary.
+        
+        ``prestat`` is an already-known stat result for the file, used instead of
+        another stat call.
+        """
         try:
-            if not os.path.exists(file_path):
-                logger.error(f"❌ File does not exist: {file_path}")
-                return {"status": "failed", "reason": "File not found"}
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if not content.strip():
-                logger.warning(f"⚠️ File is empty: {file_path}")
-                return {"status": "skipped", "reason": "Empty file"}
-            
-            frontmatter, content_without_frontmatter = self.document_processor.parse_yaml_frontmatter(content)
-            
-            if frontmatter and not force_update:
-                logger.info(f"ℹ️ Skipping file with existing frontmatter: {os.path.basename(file_path)}")
-                return {"status": "skipped", "reason": "Existing frontmatter"}
-            
-            file_stat = os.stat(file_path)
-            modification_time = datetime.fromtimestamp(file_stat.st_mtime)
-            created_date = modification_time.strftime('%Y-%m-%d')
+            prepared = self._prepare_file(file_path, force_update, prestat)
+            if isinstance(prepared, dict):
+                return prepared
             
+            content_without_frontmatter, frontmatter, created_date = prepared
             enriched_frontmatter = self._generate_frontmatter(
-                content_without_frontmatter, 
+                content_without_frontmatter,
                 created_date,
                 existing_frontmatter=frontmatter
             )
             
-            if not enriched_frontmatter:
-                logger.error(f"❌ Failed to generate frontmatter for: {os.path.basename(file_path)}")
-                return {"status": "failed", "reason": "Frontmatter generation failed"}
-            
-            frontmatter_yaml = yaml.dump(enriched_frontmatter, default_flow_style=False, sort_keys=False)
-            new_content = f"---\n{frontmatter_yaml}---\n\n{content_without_frontmatter}"
+            return self._write_enriched_file(file_path, enriched_frontmatter, content_without_frontmatter)
+        
+        except Exception as e:
+            logger.error(f"❌ Error enriching file {os.fspath(file_path)}: {e}")
+            return {"status": "failed", "reason": str(e)}
+    
+    async def aenrich_batch(self, file_paths: List[Union[str, os.DirEntry]], force_update: bool = False,
+                            limiter: Optional[RateLimiter] = None,
+                            prepared_files: Optional[List[Optional[Tuple[str, Dict, str]]]] = None) -> List[Dict[str, Any]]:
+        """Enrich several files with one LLM call per batch and return a status per file.
+        
+        File IO runs in worker threads and LLM calls are awaited via Settings.llm.acomplete.
+        
+        Args:
+            file_paths: Files to enrich
+            force_update: Whether to regenerate existing frontmatter
+            limiter: Optional rate limiter applied before each LLM request
+            prepared_files: Per file, an already-read (content_without_frontmatter,
+                existing_frontmatter, created_date) tuple, or None to read the file
+        """
+        statuses: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        pending = []  # (index, content_without_frontmatter, existing_frontmatter, created_date)
+        
+        for i, file_path in enumerate(file_paths):
+            try:
+                prepared = prepared_files[i] if prepared_files else None
+                if prepared is None:
+                    prepared = await asyncio.to_thread(self._prepare_file, file_path, force_update)
+            except Exception as e:
+                logger.error(f"❌ Error enriching file {os.fspath(file_path)}: {e}")
+                prepared = {"status": "failed", "reason": str(e)}
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            if isinstance(prepared, dict):
+                statuses[i] = prepared
+            else:
+                content_without_frontmatter, frontmatter, created_date = prepared
+                pending.append((i, content_without_frontmatter, frontmatter, created_date))
+        
+        # Split further so a single prompt stays within the character budget
+        for group in self._split_by_budget(pending):
+            frontmatters = await self._agenerate_frontmatter_batch([
+                (content, created_date, frontmatter) for _, content, frontmatter, created_date in group
+            ], limiter)
+            for (i, content, _, _), enriched_frontmatter in zip(group, frontmatters):
+                try:
+                    statuses[i] = await asyncio.to_thread(self._write_enriched_file, file_paths[i], enriched_frontmatter, content)
+                except Exception as e:
+                    logger.error(f"❌ Error enriching file {os.fspath(file_paths[i])}: {e}")
+                    statuses[i] = {"status": "failed", "reason": str(e)}
+        
+        return statuses
+    
+    def _prepare_file(self, file_path: Union[str, os.DirEntry], force_update: bool,
+                      prestat: Optional[os.stat_result] = None):
+        """Read a file and decide whether it needs enrichment.
+        
+        Args:
+            file_path: Path of the file, or a DirEntry from _iter_markdown_files whose
+                cached stat result is reused
+            force_update: Whether to regenerate existing frontmatter
+            prestat: Already-known stat result for the file
+        
+        Returns:
+            A status dictionary if the file is skipped or failed, otherwise a tuple of
+            (content_without_frontmatter, existing_frontmatter, created_date)
+        """
+        path = Path(file_path)
+        index = self.frontmatter_index
+        try:
+            file_stat = prestat
+            if file_stat is None:
+                file_stat = file_path.stat() if isinstance(file_path, os.DirEntry) else path.stat()
             
-            logger.info(f"✅ Enriched file: {os.path.basename(file_path)}")
-            return {"status": "success"}
+            if index is not None and not force_update and index.has_frontmatter(os.fspath(file_path), file_stat.st_mtime_ns):
+                logger.info(f"ℹ️ Skipping file with existing frontmatter: {path.name}")
+                return {"status": "skipped", "reason": "Existing frontmatter"}
             
-        except Exception as e:
-            logger.error(f"❌ Error enriching file {file_path}: {e}")
-            return {"status": "failed", "reason": str(e)}
+            content = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            logger.error(f"❌ File does not exist: {path}")
+            return {"status": "failed", "reason": "File not found"}
+        
+        if not content.strip():
+            logger.warning(f"⚠️ File is empty: {path}")
+            return {"status": "skipped", "reason": "Empty file"}
+        
+        frontmatter, content_without_frontmatter = DocumentProcessor.parse_yaml_frontmatter(content)
+        if index is not None:
+            index.put(os.fspath(file_path), file_stat.st_mtime_ns, bool(frontmatter))
+        
+        if frontmatter and not force_update:
+            logger.info(f"ℹ️ Skipping file with existing frontmatter: {path.name}")
+            return {"status": "skipped", "reason": "Existing frontmatter"}
+        
+        created_date = time.strftime('%Y-%m-%d', time.localtime(file_stat.st_mtime))
+        
+        return content_without_frontmatter, frontmatter, created_date
+    
+    def _write_enriched_file(self, file_path: Union[str, os.DirEntry], enriched_frontmatter: Optional[Dict[str, Any]], content_without_frontmatter: str) -> Dict[str, Any]:
+        """Write generated frontmatter back to a file and return its status."""
+        if not enriched_frontmatter:
+            logger.error(f"❌ Failed to generate frontmatter for: {os.path.basename(file_path)}")
+            return {"status": "failed", "reason": "Frontmatter generation failed"}
+        
+        frontmatter_yaml = yaml.dump(enriched_frontmatter, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
+        new_content = f"---\n{frontmatter_yaml}---\n\n{content_without_frontmatter}"
+        
+        Path(file_path).write_text(new_content, encoding='utf-8')
+        if self.frontmatter_index is not None:
+            self.frontmatter_index.put(os.fspath(file_path), os.stat(file_path).st_mtime_ns, True)
+        
+        logger.info(f"✅ Enriched file: {os.path.basename(file_path)}")
+        return {"status": "success"}
+    
+    def _split_by_budget(self, pending: List[Tuple]) -> List[List[Tuple]]:
+        """Group pending items so each group's previews fit in BATCH_CHAR_BUDGET."""
+        groups, current, current_chars = [], [], 0
+        for item in pending:
+            chars = min(len(item[1]), PREVIEW_CHARS)
+            if current and current_chars + chars > BATCH_CHAR_BUDGET:
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append(item)
+            current_chars += chars
+        if current:
+            groups.append(current)
+        return groups
     
     def enrich_directory(self, directory_path: str, force_update: bool = False, max_files: int = None, parallel: bool = True) -> Dict[str, Any]:
         """Enrich all markdown files in a directory."""
@@ -84,153 +311,430 @@ class DocumentEnricher:
             logger.error(f"❌ Directory does not exist: {directory_path}")
             return {"success": 0, "failed": 0, "skipped": 0, "total": 0}
         
-        md_files = list(directory.glob("**/*.md"))
+        # Files are walked lazily so work starts before the whole vault is listed
+        md_files = self._iter_markdown_files(directory_path)
         if max_files:
-            md_files = md_files[:max_files]
+            md_files = islice(md_files, max_files)
         
-        if not md_files:
+        first = next(md_files, None)
+        if first is None:
             logger.info("ℹ️ No markdown files found to process")
             return {"success": 0, "failed": 0, "skipped": 0, "total": 0}
+        md_files = chain([first], md_files)
         
-        logger.info(f"🚀 Starting enrichment of {len(md_files)} files in {directory_path}")
+        logger.info(f"🚀 Starting enrichment of files in {directory_path}")
         
-        if parallel and len(md_files) > 1:
-            logger.info(f"⚡ Using parallel processing with {self.max_workers} threads")
-            return self._enrich_directory_parallel(md_files, force_update)
-        else:
-            logger.info("📝 Using sequential processing")
-            return self._enrich_directory_sequential(md_files, force_update)
+        self.frontmatter_index = FrontmatterIndex.for_directory(directory_path).load()
+        try:
+            if parallel:
+                logger.info(f"⚡ Using parallel processing with {self.max_workers} concurrent LLM requests")
+                return self._enrich_directory_parallel(md_files, force_update)
+            else:
+                logger.info("📝 Using sequential processing")
+                return self._enrich_directory_sequential(md_files, force_update)
+        finally:
+            self.frontmatter_index.save()
+            self.frontmatter_index = None
+    
+    @staticmethod
+    def _iter_markdown_files(directory_path: str) -> Iterator[os.DirEntry]:
+        """Yield DirEntry objects for markdown files under a directory, recursively.
+        
+        Directory symlinks are not followed.
+        """
+        stack = [directory_path]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        yield entry
     
-    def _enrich_directory_sequential(self, md_files: List[Path], force_update: bool) -> Dict[str, Any]:
+    def _enrich_directory_sequential(self, md_files: Iterator[os.DirEntry], force_update: bool) -> Dict[str, Any]:
         """Sequential enrichment implementation."""
-        stats = {"success": 0, "failed": 0, "skipped": 0, "total": len(md_files)}
+        stats = {"success": 0, "failed": 0, "skipped": 0, "total": 0}
         
         for file_path in tqdm(md_files, desc="Enriching files sequentially"):
+            stats["total"] += 1
             try:
-                result = self.enrich_file(str(file_path), force_update)
+                result = self.enrich_file(file_path, force_update)
                 status = result.get("status", "failed")
                 stats[status] += 1
             except Exception as e:
-                logger.error(f"❌ Error processing {file_path}: {e}")
+                logger.error(f"❌ Error processing {os.fspath(file_path)}: {e}")
                 stats["failed"] += 1
         
         logger.info(f"📊 Enrichment complete: {stats['success']} success, {stats['failed']} failed, {stats['skipped']} skipped, {stats['total']} total")
         return stats
     
-    def _enrich_directory_parallel(self, md_files: List[Path], force_update: bool) -> Dict[str, Any]:
-        """Parallel enrichment implementation using ThreadPoolExecutor."""
-        stats = {"success": 0, "failed": 0, "skipped": 0, "total": len(md_files)}
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {executor.submit(self.enrich_file, str(file_path), force_update): file_path for file_path in md_files}
+    def _classify_files(self, md_files: Iterator[os.DirEntry], force_update: bool,
+                        stats: Dict[str, int]) -> Iterator[Tuple[str, Tuple[str, Dict, str]]]:
+        """Yield the files needing LLM enrichment, classifying the walk in bounded chunks.
+        
+        Reading and YAML parsing are CPU-bound, so each chunk runs in a process pool
+        while the previous chunk's results are consumed. Files that need no LLM call
+        are counted in ``stats`` instead of being yielded.
+        
+        Yields:
+            Tuples of (file_path, (content_without_frontmatter, existing_frontmatter, created_date))
+        """
+        index = self.frontmatter_index
+        needed = 0
+        
+        def settle(paths, results):
+            nonlocal needed
+            for file_path, (status, has_frontmatter, mtime_ns, parsed) in zip(paths, results):
+                if index is not None and status != "failed":
+                    index.put(file_path, mtime_ns, has_frontmatter)
+                if status is None:
+                    needed += 1
+                    created_date = time.strftime('%Y-%m-%d', time.localtime(mtime_ns / 1e9))
+                    yield file_path, (*parsed, created_date)
+                else:
+                    stats["total"] += 1
+                    stats[status] += 1
+        
+        with ProcessPoolExecutor() as executor:
+            previous = None
+            for chunk in iter(lambda: list(islice(md_files, self.CLASSIFY_CHUNK_SIZE)), []):
+                paths = []
+                for entry in chunk:
+                    file_path = os.fspath(entry)
+                    # Files indexed as enriched and unchanged since need only the stat
+                    if index is not None and index.has_frontmatter(file_path, entry.stat().st_mtime_ns):
+                        stats["total"] += 1
+                        stats["skipped"] += 1
+                    else:
+                        paths.append(file_path)
+                
+                # Submit this chunk before consuming the previous one so workers stay busy
+                current = (paths, executor.map(_classify_file, paths, repeat(force_update), chunksize=16))
+                if previous is not None:
+                    yield from settle(*previous)
+                previous = current
             
-            for future in tqdm(as_completed(future_to_file), total=len(md_files), desc="Enriching files in parallel"):
+            if previous is not None:
+                yield from settle(*previous)
+        
+        logger.info(f"🔎 {needed} of {stats['total'] + needed} files needed enrichment ({stats['skipped']} skipped, {stats['failed']} unreadable)")
+    
+    def _enrich_directory_parallel(self, md_files: Iterator[os.DirEntry], force_update: bool) -> Dict[str, Any]:
+        """Parallel enrichment implementation using asyncio.
+        
+        Files are grouped into batches of ``batch_size`` so each batch needs one
+        LLM call; at most ``max_workers`` batches are in flight at once.
+        
+        Args:
+            md_files: Files to enrich
+            force_update: Whether to regenerate existing frontmatter
+        """
+        return asyncio.run(self._aenrich_directory(md_files, force_update))
+    
+    async def _aenrich_directory(self, md_files: Iterator[os.DirEntry], force_update: bool) -> Dict[str, Any]:
+        """Run batches concurrently under a semaphore and optional rate limit.
+        
+        Batches are scheduled while the directory walk is still in progress; at
+        most ``2 * max_workers`` are queued at a time to bound memory.
+        """
+        stats = {"success": 0, "failed": 0, "skipped": 0, "total": 0}
+        # Files settled by classification; kept apart because the classifier runs in a worker thread
+        classified = {"failed": 0, "skipped": 0, "total": 0}
+        if force_update:
+            items = ((file_path, None) for file_path in md_files)
+        else:
+            # Most files usually have frontmatter already; find the ones that need
+            # the LLM on all cores, chunk by chunk as the walk produces them
+            items = self._classify_files(iter(md_files), force_update, classified)
+        
+        max_pending = 2 * self.max_workers
+        semaphore = asyncio.Semaphore(self.max_workers)
+        limiter = RateLimiter(self.requests_per_minute) if self.requests_per_minute else None
+        
+        async def bounded(batch):
+            file_paths = [file_path for file_path, _ in batch]
+            async with semaphore:
                 try:
-                    result = future.result()
-                    stats[result["status"]] += 1
+                    return batch, await self.aenrich_batch(
+                        file_paths, force_update, limiter, [prepared for _, prepared in batch]
+                    )
                 except Exception as e:
-                    file_path = future_to_file[future]
-                    logger.error(f"❌ Error processing {file_path}: {e}")
-                    stats["failed"] += 1
+                    logger.error(f"❌ Error processing batch starting at {os.fspath(file_paths[0])}: {e}")
+                    return batch, None
+        
+        def collect(done):
+            for task in done:
+                batch, results = task.result()
+                if results is None:
+                    stats["failed"] += len(batch)
+                else:
+                    for result in results:
+                        stats[result["status"]] += 1
+                progress.update(len(batch))
+        
+        def next_batch():
+            return list(islice(items, self.batch_size))
+        
+        pending = set()
+        with tqdm(desc="Enriching files in parallel") as progress:
+            # Walking and classifying block, so they run off the event loop
+            while batch := await asyncio.to_thread(next_batch):
+                stats["total"] += len(batch)
+                pending.add(asyncio.create_task(bounded(batch)))
+                if len(pending) >= max_pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+        
+        for key, count in classified.items():
+            stats[key] += count
         
         logger.info(f"📊 Parallel enrichment complete: {stats['success']} success, {stats['failed']} failed, {stats['skipped']} skipped, {stats['total']} total")
         return stats
     
-    def _generate_frontmatter(self, content: str, created_date: str, existing_frontmatter: Dict = None) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _preview(content: str) -> str:
+        """Prepare content preview for LLM (limit to avoid token limits)."""
+        content_preview = content.strip()[:PREVIEW_CHARS]
+        if len(content) > PREVIEW_CHARS:
+            content_preview += "..."
+        return content_preview
+    
+    @staticmethod
+    def _extract_json(response_text: str) -> str:
+        """Strip code fences and surrounding text from an LLM JSON response."""
+        response_text = response_text.strip()
+        
+        if response_text.startswith('```json'):
+            response_text = response_text[7:]
+        if response_text.startswith('```'):
+            response_text = response_text[3:]
+        if response_text.endswith('```'):
+            response_text = response_text[:-3]
+        
+        response_text = response_text.strip()
+        
+        # Find JSON object
+        start = response_text.find('{')
+        end = response_text.rfind('}') + 1
+        if start >= 0 and end > start:
+            response_text = response_text[start:end]
+        
+        return response_text
+    
+    @staticmethod
+    def _build_frontmatter(llm_data: Dict[str, Any], created_date: str, existing_frontmatter: Dict = None) -> Dict[str, Any]:
+        """Merge LLM-generated fields with existing frontmatter."""
+        frontmatter = {}
+        
+        # Preserve existing fields or set defaults
+        if existing_frontmatter:
+            frontmatter.update(existing_frontmatter)
+        
+        # Set standard fields
+        frontmatter['created'] = frontmatter.get('created', created_date)
+        
+        # Set LLM-generated fields
+        frontmatter['title'] = llm_data.get('title', 'No content provided')
+        frontmatter['description'] = llm_data.get('description', 'No information available to create a description.')
+        frontmatter['tags'] = llm_data.get('tags', [])
+        
+        return frontmatter
+    
+    @classmethod
+    def build_frontmatter_prompt(cls, content: str) -> str:
+        """Build the single-document frontmatter prompt for the given content."""
+        return _FRONTMATTER_PROMPT_PREFIX + cls._preview(content)
+    
+    def _generate_frontmatter(self, content: str, created_date: str, existing_frontmatter: Dict = None,
+                              shared_response: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Generate frontmatter using LLM.
         
         Args:
             content: Content of the document
             created_date: Creation date in YYYY-MM-DD format
             existing_frontmatter: Existing frontmatter to preserve
-            
+            shared_response: Already-parsed LLM output for this document (e.g. from
+                services.llm_pipeline.complete_multi); skips the LLM call when given
+        
         Returns:
             Dictionary with generated frontmatter or None if failed
         """
+        if shared_response is not None:
+            return self._build_frontmatter(shared_response, created_date, existing_frontmatter)
+        
         if not Settings.llm:
             logger.error("❌ LLM not available for frontmatter generation")
             return None
         
-        # Prepare content preview for LLM (limit to avoid token limits)
-        content_preview = content.strip()[:2000]
-        if len(content) > 2000:
-            content_preview += "..."
+        try:
+            prompt, cache_key, llm_data = self._lookup_frontmatter(content)
+            if llm_data is None:
+                llm_data = self._complete_frontmatter(prompt)
+                self._store_frontmatter(cache_key, llm_data)
+            return self._build_frontmatter(llm_data, created_date, existing_frontmatter)
+        
+        except Exception as e:
+            logger.error(f"❌ Error generating frontmatter with LLM: {e}")
+            return self._fallback_frontmatter(created_date, existing_frontmatter)
+    
+    async def _agenerate_frontmatter(self, content: str, created_date: str, existing_frontmatter: Dict = None,
+                                     limiter: Optional[RateLimiter] = None) -> Optional[Dict[str, Any]]:
+        """Async counterpart of _generate_frontmatter."""
+        if not Settings.llm:
+            logger.error("❌ LLM not available for frontmatter generation")
+            return None
         
-        prompt = f"""Analyze the following document content and generate YAML frontmatter metadata.
-
-Document content:
-{content_preview}
-
-Generate a JSON object with the following fields:
-- "title": A concise, descriptive title for the document (max 60 chars)
-- "description": A brief description summarizing the content (1-2 sentences)
-- "tags": An array of relevant tags (3-8 tags, use lowercase with hyphens)
-
-Guidelines:
-- Make the title specific and informative
-- Keep descriptions concise but meaningful
-- Use specific, relevant tags that categorize the content
-- For daily notes, include activity-based tags like "work", "personal", "learning"
-- For technical content, include technology/topic tags
-- Avoid generic tags like "note" or "document"
-
-Return ONLY a valid JSON object with these exact field names."""
-
         try:
-            response = Settings.llm.complete(prompt)
-            response_text = response.text.strip()
-            
-            logger.debug(f"LLM frontmatter response: {response_text}")
-            
-            # Clean up response
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            
-            # Find JSON object
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start >= 0 and end > start:
-                response_text = response_text[start:end]
-            
-            # Parse LLM response
-            import json
-            llm_data = json.loads(response_text)
-            
-            # Build frontmatter
-            frontmatter = {}
-            
-            # Preserve existing fields or set defaults
-            if existing_frontmatter:
-                frontmatter.update(existing_frontmatter)
-            
-            # Set standard fields
-            frontmatter['created'] = frontmatter.get('created', created_date)
-            
-            # Set LLM-generated fields
-            frontmatter['title'] = llm_data.get('title', 'No content provided')
-            frontmatter['description'] = llm_data.get('description', 'No information available to create a description.')
-            frontmatter['tags'] = llm_data.get('tags', [])
-            
-            return frontmatter
-            
+            prompt, cache_key, llm_data = self._lookup_frontmatter(content)
+            if llm_data is None:
+                llm_data = await self._acomplete_frontmatter(prompt, limiter)
+                self._store_frontmatter(cache_key, llm_data)
+            return self._build_frontmatter(llm_data, created_date, existing_frontmatter)
+        
         except Exception as e:
             logger.error(f"❌ Error generating frontmatter with LLM: {e}")
-            
-            # Fallback frontmatter
-            fallback = {
-                'created': created_date,
-                'description': 'No information available to create a description.',
-                'title': 'No content provided',
-                'tags': []
-            }
-            
-            if existing_frontmatter:
-                fallback.update(existing_frontmatter)
-                
-            return fallback
+            return self._fallback_frontmatter(created_date, existing_frontmatter)
+    
+    @classmethod
+    def _lookup_frontmatter(cls, content: str) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+        """Build a document's frontmatter prompt and cache key, and return any cached LLM response.
+        
+        Returns:
+            Tuple of (prompt, cache_key, cached LLM data or None)
+        """
+        prompt = cls.build_frontmatter_prompt(content)
+        cache = get_llm_cache()
+        cache_key = cache.make_key(prompt)
+        cached = cache.get(cache_key)
+        if cached is None:
+            return prompt, cache_key, None
+        
+        llm_data = _json_loads(cached)
+        logger.debug(f"LLM frontmatter response (cached): {llm_data}")
+        return prompt, cache_key, llm_data
+    
+    @staticmethod
+    def _store_frontmatter(cache_key: str, llm_data: Dict[str, Any]):
+        """Cache a fresh LLM frontmatter response."""
+        logger.debug(f"LLM frontmatter response: {llm_data}")
+        get_llm_cache().set(cache_key, json.dumps(llm_data))
+    
+    @classmethod
+    def _parse_frontmatter_response(cls, response_text: str) -> Dict[str, Any]:
+        """Parse a plain-completion frontmatter response."""
+        return _json_loads(cls._extract_json(response_text))
+    
+    @classmethod
+    def _complete_frontmatter(cls, prompt: str) -> Dict[str, Any]:
+        """Ask the LLM for one document's frontmatter fields."""
+        try:
+            return structured_complete(FrontmatterFields, prompt)
+        except Exception as e:
+            # Backends without structured output support: one plain completion
+            logger.debug(f"Structured frontmatter output failed, falling back to plain completion: {e}")
+            return cls._parse_frontmatter_response(Settings.llm.complete(prompt).text)
+    
+    @classmethod
+    async def _acomplete_frontmatter(cls, prompt: str, limiter: Optional[RateLimiter] = None) -> Dict[str, Any]:
+        """Async counterpart of _complete_frontmatter, honouring the rate limit."""
+        if limiter:
+            await limiter.acquire()
+        try:
+            return await astructured_complete(FrontmatterFields, prompt)
+        except Exception as e:
+            logger.debug(f"Structured frontmatter output failed, falling back to plain completion: {e}")
+            return cls._parse_frontmatter_response((await Settings.llm.acomplete(prompt)).text)
+    
+    @staticmethod
+    def _fallback_frontmatter(created_date: str, existing_frontmatter: Dict = None) -> Dict[str, Any]:
+        """Placeholder frontmatter used when the LLM response cannot be used."""
+        fallback = {
+            'created': created_date,
+            'description': 'No information available to create a description.',
+            'title': 'No content provided',
+            'tags': []
+        }
+        
+        if existing_frontmatter:
+            fallback.update(existing_frontmatter)
+        
+        return fallback
+    
+    async def _agenerate_frontmatter_batch(self, items: List[Tuple[str, str, Optional[Dict]]],
+                                           limiter: Optional[RateLimiter] = None) -> List[Optional[Dict[str, Any]]]:
+        """Generate frontmatter for several documents with a single LLM call.
+        
+        Args:
+            items: List of (content, created_date, existing_frontmatter) tuples
+            limiter: Optional rate limiter applied before each LLM request
+        
+        Returns:
+            Frontmatter per item, in the same order. Items the batched response
+            does not cover are generated individually.
+        """
+        if len(items) == 1:
+            content, created_date, existing_frontmatter = items[0]
+            return [await self._agenerate_frontmatter(content, created_date, existing_frontmatter, limiter)]
+        
+        if not Settings.llm:
+            logger.error("❌ LLM not available for frontmatter generation")
+            return [None] * len(items)
+        
+        by_id: Dict[int, Dict[str, Any]] = {}
+        try:
+            if limiter:
+                await limiter.acquire()
+            response = await Settings.llm.acomplete(self._build_batch_prompt(items))
+            by_id = self._parse_batch_response(response.text.strip(), len(items))
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Batch frontmatter generation failed, falling back to single-document mode: {e}")
+        
+        frontmatters = []
+        for i, (content, created_date, existing_frontmatter) in enumerate(items, 1):
+            if i in by_id:
+                frontmatters.append(self._build_frontmatter(by_id[i], created_date, existing_frontmatter))
+            else:
+                frontmatters.append(await self._agenerate_frontmatter(content, created_date, existing_frontmatter, limiter))
+        
+        return frontmatters
+    
+    @classmethod
+    def _build_batch_prompt(cls, items: List[Tuple[str, str, Optional[Dict]]]) -> str:
+        """Build the multi-document frontmatter prompt; documents are numbered from 1."""
+        return _FRONTMATTER_BATCH_PROMPT_PREFIX + "\n\n".join(
+            f"Document {i}:\n{cls._preview(content)}" for i, (content, _, _) in enumerate(items, 1)
+        )
+    
+    @classmethod
+    def _parse_batch_response(cls, response_text: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """Map document number (1..count) to its entry in a batched frontmatter response.
+        
+        Entries are matched by their echoed id when the ids are exactly 1..count.
+        Otherwise, if the response has one entry per document, they are matched by
+        position; failing that, only entries with a valid in-range id are kept.
+        """
+        logger.debug(f"LLM batch frontmatter response: {response_text}")
+        
+        results = _json_loads(cls._extract_json(response_text)).get('results', [])
+        entries = [entry for entry in results if isinstance(entry, dict)] if isinstance(results, list) else []
+        
+        by_id = {}
+        for entry in entries:
+            try:
+                doc_id = int(entry['id'])
+            except (KeyError, ValueError, TypeError):
+                continue
+            if 1 <= doc_id <= count and doc_id not in by_id:
+                by_id[doc_id] = entry
+        
+        if len(by_id) == count:
+            return by_id
+        if len(entries) == count:
+            logger.debug("Batch response ids do not match the documents, mapping entries by position")
+            return dict(enumerate(entries, 1))
+        return by_id
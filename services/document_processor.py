@@ -2,11 +2,17 @@
 
 import os
 import re
+import functools
 import yaml
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 from llama_index.core import Document
 
@@ -15,6 +21,21 @@ from models.file_metadata import FileMetadata
 
 logger = logging.getLogger(__name__)
 
+if _YamlLoader is yaml.SafeLoader:
+    logger.warning("⚠️ PyYAML was built without libyaml; frontmatter parsing falls back to the slower pure-Python loader")
+
+_HASHTAG_RE = re.compile(r'#([a-zA-Z0-9_-]+)')
+_FILENAME_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+# Frontmatter block: opening '---' at the start of the file up to the first closing '\n---'
+_FM_RE = re.compile(r'\A---(.*?)\n---', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_date_from_filename(filename: str) -> Optional[str]:
+    """Return the first YYYY-MM-DD date in a filename, or None if it has none."""
+    date_match = _FILENAME_DATE_RE.search(filename)
+    return date_match.group(1) if date_match else None
+
 
 class DocumentProcessor:
     """Process documents and extract metadata for hybrid RDBMS + semantic search."""
@@ -29,24 +50,13 @@ class DocumentProcessor:
         Returns:
             Tuple of (frontmatter_dict, content_without_frontmatter)
         """
-        if not content.startswith('---'):
+        match = _FM_RE.match(content)
+        if not match:
             return {}, content
             
         try:
-            # Find the end of frontmatter
-            end_marker = content.find('\n---\n', 3)
-            if end_marker == -1:
-                end_marker = content.find('\n---', 3)
-                if end_marker == -1:
-                    return {}, content
-                    
-            # Extract frontmatter
-            frontmatter_text = content[3:end_marker]
-            remaining_content = content[end_marker + 4:].strip()
-            
-            # Parse YAML
-            frontmatter = yaml.safe_load(frontmatter_text) or {}
-            return frontmatter, remaining_content
+            frontmatter = yaml.load(match.group(1), Loader=_YamlLoader) or {}
+            return frontmatter, content[match.end():].lstrip('\n')
             
         except yaml.YAMLError as e:
             logger.warning(f"Could not parse YAML frontmatter: {e}")
@@ -60,10 +70,9 @@ class DocumentProcessor:
             content: Content to extract hashtags from
             
         Returns:
-            List of hashtags found
+            List of hashtags found, in order of first appearance
         """
-        tag_pattern = r'#([a-zA-Z0-9_-]+)'
-        return list(set(re.findall(tag_pattern, content)))
+        return list(dict.fromkeys(_HASHTAG_RE.findall(content)))
     
     @staticmethod
     def extract_all_tags(frontmatter: Dict, content: str) -> List[str]:
@@ -85,19 +94,21 @@ class DocumentProcessor:
             tags.append(yaml_tags)
         elif isinstance(yaml_tags, list):
             # Handle list of tags
-            tags.extend([str(tag) for tag in yaml_tags])
+            tags.extend(yaml_tags)
             
         # Get hashtags from content
-        content_tags = DocumentProcessor.extract_hashtags_from_content(content)
-        tags.extend(content_tags)
+        tags.extend(_HASHTAG_RE.findall(content))
         
-        # Clean and deduplicate
+        # Clean and deduplicate in one pass, keeping first-seen order
+        seen = set()
         cleaned_tags = []
         for tag in tags:
-            clean_tag = str(tag).strip().lower()
-            if clean_tag and clean_tag not in cleaned_tags:
+            # YAML tags are almost always strings already
+            clean_tag = (tag if isinstance(tag, str) else str(tag)).strip().lower()
+            if clean_tag and clean_tag not in seen:
+                seen.add(clean_tag)
                 cleaned_tags.append(clean_tag)
-                
+        
         return cleaned_tags
     
     @staticmethod
@@ -116,6 +127,13 @@ class DocumentProcessor:
         date_value = frontmatter['date']
         
         if isinstance(date_value, str):
+            # Already YYYY-MM-DD: skip the strptime/strftime round-trip
+            head = date_value[:10]
+            if (len(head) == 10 and head[4] == '-' and head[7] == '-'
+                    and head[:4].isdigit() and head[5:7].isdigit() and head[8:].isdigit()
+                    and '01' <= head[5:7] <= '12' and '01' <= head[8:] <= '31'):
+                return head
+            
             # Try to parse date string
             try:
                 parsed_date = datetime.strptime(date_value[:10], '%Y-%m-%d')
@@ -139,8 +157,7 @@ class DocumentProcessor:
         Returns:
             Date string in YYYY-MM-DD format or None
         """
-        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
-        return date_match.group(1) if date_match else None
+        return _extract_date_from_filename(filename)
     
     @classmethod
     def extract_file_metadata(cls, doc: Document) -> FileMetadata:
@@ -194,17 +211,19 @@ class DocumentProcessor:
         Returns:
             Enhanced document with metadata prepended
         """
-        enhanced_text = f"File: {metadata.filename}\n"
+        parts = [f"File: {metadata.filename}\n"]
         
         if metadata.extracted_date:
-            enhanced_text += f"Date: {metadata.extracted_date}\n"
+            parts.append(f"Date: {metadata.extracted_date}\n")
         
         if metadata.tags:
-            enhanced_text += f"Tags: {', '.join(metadata.tags)}\n"
+            parts.append(f"Tags: {', '.join(metadata.tags)}\n")
         
-        enhanced_text += f"\nContent:\n{doc.text}"
+        parts.append("\nContent:\n")
+        parts.append(doc.text)
         
-        return Document(text=enhanced_text, metadata=doc.metadata)
+        # One join copies the (possibly large) document text once
+        return Document(text="".join(parts), metadata=doc.metadata)
     
     @classmethod
     def create_content_preview(cls, doc: Document, max_length: int = 1000) -> str:
@@ -0,0 +1,83 @@
+"""Sidecar index recording which vault files already carry frontmatter."""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+    from json import loads as _json_loads
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+
+class FrontmatterIndex:
+    """Map of file path to (mtime_ns, has_frontmatter), persisted as JSON.
+    
+    An entry is only trusted while the file's mtime is unchanged, so files
+    edited since the last run are read again.
+    """
+    
+    FILENAME = ".rag_fm_index.json"
+    
+    def __init__(self, index_path: str):
+        """Initialize the index.
+        
+        Args:
+            index_path: Path of the JSON index file
+        """
+        self.index_path = Path(index_path)
+        self._entries: Dict[str, Tuple[int, bool]] = {}
+        self._dirty = False
+    
+    @classmethod
+    def for_directory(cls, directory_path: str) -> 'FrontmatterIndex':
+        """Return the index stored at the root of a vault directory."""
+        return cls(os.path.join(directory_path, cls.FILENAME))
+    
+    def load(self) -> 'FrontmatterIndex':
+        """Load entries from disk; a missing or unreadable index starts empty."""
+        try:
+            raw = _json_loads(self.index_path.read_bytes())
+            self._entries = {path: (int(mtime_ns), bool(flag)) for path, (mtime_ns, flag) in raw.items()}
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable frontmatter index {self.index_path}: {e}")
+            self._entries = {}
+        self._dirty = False
+        return self
+    
+    def save(self):
+        """Write entries to disk if anything changed since the last load or save."""
+        if not self._dirty:
+            return
+        
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(_json_dumps(self._entries))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save frontmatter index {self.index_path}: {e}")
+    
+    def get(self, path: str) -> Optional[Tuple[int, bool]]:
+        """Return (mtime_ns, has_frontmatter) for a path, or None if unknown."""
+        return self._entries.get(path)
+    
+    def put(self, path: str, mtime_ns: int, has_frontmatter: bool):
+        """Record whether a file has frontmatter at the given mtime."""
+        entry = (mtime_ns, has_frontmatter)
+        if self._entries.get(path) != entry:
+            self._entries[path] = entry
+            self._dirty = True
+    
+    def has_frontmatter(self, path: str, mtime_ns: int) -> bool:
+        """Return True if the file is known to have frontmatter at this mtime."""
+        return self._entries.get(path) == (mtime_ns, True)
@@ -0,0 +1,139 @@
+"""Deterministic LLM response cache keyed on model, prompt and temperature."""
+
+import os
+import time
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from llama_index.core.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Set to a redis:// URL to share the cache across processes
+REDIS_URL_ENV = "RAG_LLM_CACHE_REDIS_URL"
+# Entry lifetime in seconds (0 disables expiry)
+TTL_ENV = "RAG_LLM_CACHE_TTL"
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU store with per-entry expiry."""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, ttl: int):
+        expires_at = time.monotonic() + ttl if ttl else 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisBackend:
+    """Redis-backed store; requires the optional ``redis`` package."""
+    
+    def __init__(self, url: str, prefix: str = "rag-obsidian:llm:"):
+        import redis
+        
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+    
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self._prefix + key)
+        return value.decode('utf-8') if value is not None else None
+    
+    def set(self, key: str, value: str, ttl: int):
+        self._client.set(self._prefix + key, value, ex=ttl or None)
+
+
+class LLMCache:
+    """Exact-match cache for raw LLM response text."""
+    
+    def __init__(self, backend=None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """Initialize the cache.
+        
+        Args:
+            backend: Storage backend with get(key) and set(key, value, ttl); defaults to MemoryBackend
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+        """
+        self.backend = backend or MemoryBackend()
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(prompt: str, model: Optional[str] = None, temperature: Optional[float] = None) -> str:
+        """Build a cache key; the current Settings.llm supplies model and temperature when omitted."""
+        llm = Settings.llm
+        if model is None:
+            model = getattr(llm, 'model', None)
+        if temperature is None:
+            temperature = getattr(llm, 'temperature', None)
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss."""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache lookup failed: {e}")
+            value = None
+        
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str):
+        """Store response text under a key."""
+        try:
+            self.backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache store failed: {e}")
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM cache, creating it from the environment on first use."""
+    global _cache
+    
+    with _cache_lock:
+        if _cache is None:
+            ttl = int(os.environ.get(TTL_ENV, DEFAULT_TTL_SECONDS))
+            backend = None
+            redis_url = os.environ.get(REDIS_URL_ENV)
+            if redis_url:
+                try:
+                    backend = RedisBackend(redis_url)
+                    logger.info(f"🗄️ Using Redis LLM cache: {redis_url}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Redis LLM cache unavailable, using in-memory cache: {e}")
+            _cache = LLMCache(backend, ttl_seconds=ttl)
+        return _cache
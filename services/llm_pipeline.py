@@ -0,0 +1,113 @@
+"""Fused LLM calls: answer several independent prompts with a single completion."""
+
+import json
+import logging
+from typing import Dict, Any, Type
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from llama_index.core.prompts import PromptTemplate
+from llama_index.core.settings import Settings
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# The prompt is passed as a template variable so braces inside it are not
+# treated as template fields
+_PASSTHROUGH_TEMPLATE = PromptTemplate("{text}")
+
+
+def complete_multi(prompts: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Run several JSON-returning prompts in one LLM round-trip.
+    
+    Each prompt is labelled with its task name and the LLM is asked for one JSON
+    object keyed by task name. The per-task results can be handed to callers
+    that accept a ``shared_response``, e.g.::
+    
+        results = complete_multi({
+            'query_parse': build_query_prompt(query),
+            'frontmatter': DocumentEnricher.build_frontmatter_prompt(content),
+        })
+        parsed = parse_query_with_llm(query, shared_response=results['query_parse'])
+    
+    Args:
+        prompts: Mapping of task name to prompt text
+    
+    Returns:
+        Mapping of task name to parsed JSON result ({} for tasks the LLM missed)
+    
+    Raises:
+        ValueError: If no LLM is configured or the response is not valid JSON
+    """
+    if Settings.llm is None:
+        raise ValueError("LLM is required but Settings.llm is None")
+    
+    sections = "\n\n".join(f"### TASK {name}\n{prompt}" for name, prompt in prompts.items())
+    template = ", ".join(f'"{name}": {{...}}' for name in prompts)
+    
+    prompt = f"""Complete each of the following independent tasks. Each task asks for a JSON object.
+
+{sections}
+
+### OUTPUT
+Return ONLY a single valid JSON object whose keys are the task names and whose values are each task's JSON result: {{{template}}}"""
+    
+    response = Settings.llm.complete(prompt)
+    response_text = response.text.strip()
+    
+    logger.debug(f"LLM multi-task response: {response_text}")
+    
+    # Clean up response
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    
+    start = response_text.find('{')
+    end = response_text.rfind('}') + 1
+    if start >= 0 and end > start:
+        response_text = response_text[start:end]
+    
+    try:
+        combined = _json_loads(response_text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not parse multi-task LLM response: {e}")
+    
+    if not isinstance(combined, dict):
+        raise ValueError("Multi-task LLM response is not a JSON object")
+    
+    results = {}
+    for name in prompts:
+        value = combined.get(name)
+        results[name] = value if isinstance(value, dict) else {}
+    
+    return results
+
+
+def structured_complete(output_cls: Type[BaseModel], prompt: str) -> Dict[str, Any]:
+    """Ask the LLM for output matching a pydantic model.
+    
+    Uses the LLM's structured output support (function calling where the backend
+    offers it, otherwise schema-guided completion), so the result is validated
+    against ``output_cls`` instead of being repaired by hand.
+    
+    Args:
+        output_cls: Pydantic model describing the expected fields
+        prompt: Prompt text
+    
+    Returns:
+        The validated result as a dictionary
+    """
+    result = Settings.llm.structured_predict(output_cls, _PASSTHROUGH_TEMPLATE, text=prompt)
+    return result.model_dump()
+
+
+async def astructured_complete(output_cls: Type[BaseModel], prompt: str) -> Dict[str, Any]:
+    """Async counterpart of structured_complete."""
+    result = await Settings.llm.astructured_predict(output_cls, _PASSTHROUGH_TEMPLATE, text=prompt)
+    return result.model_dump()
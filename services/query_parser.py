@@ -1,139 +1,180 @@
 """LLM-powered query parsing to extract structured data from natural language."""
 
+import re
 import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from llama_index.core.settings import Settings
+from pydantic import BaseModel, Field
+
+from services.llm_cache import get_llm_cache
+from services.llm_pipeline import structured_complete
 
 logger = logging.getLogger(__name__)
 
+# Queries simple enough to parse without the LLM
+_DATE_QUERY_RE = re.compile(r'\d{4}(?:-\d{2}(?:-\d{2})?)?')
+_HASHTAGS_QUERY_RE = re.compile(r'#[\w/-]+(?:\s+#[\w/-]+)*')
+_FILENAME_QUERY_RE = re.compile(r'[\w .-]+\.md', re.IGNORECASE)
+
+
+class QueryFields(BaseModel):
+    """Structured output schema for query parsing."""
+    dates: List[str] = Field(default_factory=list)
+    tags: List[str] = Field(default_factory=list)
 
-def parse_query_with_llm(query: str) -> Dict[str, Any]:
-    """Parse query using LLM and return structured data.
-    
-    Requires LLM to be configured - will raise ValueError if LLM is unavailable.
-    """
-    # Ensure an LLM is configured - REQUIRED, no fallback
-    try:
-        llm_instance = Settings.llm
-        if llm_instance is None:
-            raise ValueError("LLM is required but Settings.llm is None")
-        logger.info(f"LLM available: {type(llm_instance).__name__}")
-    except Exception as e:
-        raise ValueError(f"LLM is required but not available: {e}")
 
-    prompt = f"""You must analyze this query EXACTLY and return JSON: "{query}"
+# Fixed instructions go first and only the query is appended, so inference
+# servers with prefix caching can reuse the shared prefix
+_QUERY_PROMPT_PREFIX = """You must analyze the query given at the end EXACTLY and return JSON.
 
 STRICT RULES:
 1. DATES array: Add dates ONLY if the query contains month names (January, March), years (2024, 2025), quarters (Q1, Q2), or specific dates. If NO date words exist, dates must be empty [].
 2. TAGS array: Extract the main topic mentioned and add related words.
 
-Template: {{"dates": [], "tags": []}}
+Template: {"dates": [], "tags": []}
 
-CRITICAL: For "{query}" - scan for date words first:
+CRITICAL: Scan the query for date words first:
 - Does it contain months? (January, February, March, etc.)
 - Does it contain years? (2024, 2025, etc.) 
 - Does it contain quarters? (Q1, Q2, etc.)
 - If NO date words found, dates MUST be []
 
 Examples:
-- "jan 2023" → {{"dates": ["2023-01"], "tags": []}}
-- "Q1 2025" → {{"dates": ["2025-01", "2025-02", "2025-03"], "tags": []}}
-- "what is kubernetes?" → {{"dates": [], "tags": ["kubernetes", "k8s", "container", "orchestration"]}}
-- "what do I know about stripe?" → {{"dates": [], "tags": ["stripe", "payment", "payments", "billing", "api"]}}
-- "notes about AI" → {{"dates": [], "tags": ["ai", "artificial intelligence", "machine learning", "ml"]}}
+- "jan 2023" → {"dates": ["2023-01"], "tags": []}
+- "Q1 2025" → {"dates": ["2025-01", "2025-02", "2025-03"], "tags": []}
+- "what is kubernetes?" → {"dates": [], "tags": ["kubernetes", "k8s", "container", "orchestration"]}
+- "what do I know about stripe?" → {"dates": [], "tags": ["stripe", "payment", "payments", "billing", "api"]}
+- "notes about AI" → {"dates": [], "tags": ["ai", "artificial intelligence", "machine learning", "ml"]}
 
-Return ONLY JSON for: "{query}"""
+Return ONLY JSON for: """
 
-    try:
-        response = Settings.llm.complete(prompt)
-        response_text = response.text.strip()
-        
-        logger.info(f"Raw LLM response: {repr(response_text)}")
-        
-        # Clean up response
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Find JSON with better error handling
-        start = response_text.find('{')
-        end = response_text.rfind('}') + 1
-        if start >= 0 and end > start:
-            response_text = response_text[start:end]
-        
-        if not response_text.startswith('{'):
-            # Try to extract JSON using regex as fallback
-            import re
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group()
-            else:
-                # Create fallback result
-                logger.warning(f"Could not extract JSON from response: {response_text[:100]}...")
-                return {"dates": [], "tags": []}
+
+def build_query_prompt(query: str) -> str:
+    """Build the query-parsing prompt for a natural language query."""
+    return f'{_QUERY_PROMPT_PREFIX}"{query}"'
+
+
+def parse_query_fast(query: str) -> Optional[Dict[str, Any]]:
+    """Parse trivial queries with regular expressions, skipping the LLM.
+    
+    Handles a bare date (2025, 2025-01, 2025-01-02), one or more hashtags
+    (#project #ai) and a bare note filename (2025-01-02.md).
+    
+    Args:
+        query: Natural language query
         
-        # Try to parse JSON with comprehensive error recovery
+    Returns:
+        Parsed result in the same shape as parse_query_with_llm, or None if
+        the query needs the LLM
+    """
+    query = query.strip()
+    
+    if _DATE_QUERY_RE.fullmatch(query):
+        return {"dates": [query], "tags": []}
+    if _HASHTAGS_QUERY_RE.fullmatch(query):
+        return {"dates": [], "tags": [tag.lstrip('#').lower() for tag in query.split()]}
+    if _FILENAME_QUERY_RE.fullmatch(query):
+        return {"dates": [], "tags": [], "filenames": [query]}
+    return None
+
+
+def parse_query_with_llm(query: str, shared_response: Optional[Dict[str, Any]] = None,
+                         use_cache: bool = True) -> Dict[str, Any]:
+    """Parse query using LLM and return structured data.
+    
+    Requires LLM to be configured - will raise ValueError if LLM is unavailable.
+    
+    Args:
+        query: Natural language query
+        shared_response: Already-parsed LLM output for this query (e.g. from
+            services.llm_pipeline.complete_multi); skips the LLM call when given
+        use_cache: Reuse the parse of an earlier query that differs only in case
+            or surrounding whitespace
+    """
+    if shared_response is not None:
+        return _normalize_result(shared_response)
+    
+    # Ensure an LLM is configured - REQUIRED, no fallback
+    try:
+        llm_instance = Settings.llm
+        if llm_instance is None:
+            raise ValueError("LLM is required but Settings.llm is None")
+        logger.info(f"LLM available: {type(llm_instance).__name__}")
+    except Exception as e:
+        raise ValueError(f"LLM is required but not available: {e}")
+
+    prompt = build_query_prompt(query)
+
+    cache = get_llm_cache() if use_cache else None
+    if cache is not None:
+        cache_key = cache.make_key(build_query_prompt(query.strip().lower()))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Cached LLM response: {cached!r}")
+            return _normalize_result(_json_loads(cached))
+    
+    try:
         try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            # Try multiple fixes for common JSON issues
-            import re
-            
-            # Fix 1: Replace single quotes with double quotes
-            fixed_json = response_text.replace("'", '"')
-            
-            # Fix 2: Fix unquoted property names
-            fixed_json = re.sub(r'([{,])\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', fixed_json)
-            
-            # Fix 3: Fix unquoted string values in arrays
-            fixed_json = re.sub(r':\s*\[([^\]]*)\]', lambda m: '[' + re.sub(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*([,\]])', r'"\1"\2', m.group(1)) + ']', fixed_json)
-            
-            # Fix 4: Fix trailing commas
-            fixed_json = re.sub(r',\s*}', '}', fixed_json)
-            fixed_json = re.sub(r',\s*]', ']', fixed_json)
-            
-            try:
-                parsed = json.loads(fixed_json)
-            except json.JSONDecodeError:
-                # Fix 5: Try to extract just the structure we need
-                try:
-                    dates_match = re.search(r'"dates"\s*:\s*\[([^\]]*)\]', fixed_json)
-                    tags_match = re.search(r'"tags"\s*:\s*\[([^\]]*)\]', fixed_json)
-                    
-                    dates = []
-                    tags = []
-                    
-                    if dates_match:
-                        dates_str = dates_match.group(1)
-                        dates = [d.strip().strip('"\'') for d in dates_str.split(',') if d.strip()]
-                    
-                    if tags_match:
-                        tags_str = tags_match.group(1)
-                        tags = [t.strip().strip('"\'') for t in tags_str.split(',') if t.strip()]
-                    
-                    parsed = {"dates": dates, "tags": tags}
-                except Exception:
-                    logger.warning(f"Could not parse JSON even after comprehensive fixing: {response_text[:100]}...")
-                    return {"dates": [], "tags": []}
-        
-        # Ensure result has required fields
-        if not isinstance(parsed, dict):
-            parsed = {"dates": [], "tags": []}
-        
-        if "dates" not in parsed:
-            parsed["dates"] = []
-        if "tags" not in parsed:
-            parsed["tags"] = []
+            parsed = structured_complete(QueryFields, prompt)
+        except Exception as e:
+            # Backends without structured output support: one plain completion
+            logger.warning(f"Structured query parsing failed, falling back to plain completion: {e}")
+            parsed = _parse_plain_response(Settings.llm.complete(prompt).text)
+            if parsed is None:
+                return {"dates": [], "tags": []}
         
+        parsed = _normalize_result(parsed)
         logger.debug(f"Parsed result: {parsed}")
+        
+        if cache is not None:
+            cache.set(cache_key, json.dumps(parsed))
         return parsed
         
     except Exception as e:
-        raise ValueError(f"LLM parsing failed: {e}")
\ No newline at end of file
+        raise ValueError(f"LLM parsing failed: {e}")
+
+
+def _parse_plain_response(response_text: str) -> Optional[Dict[str, Any]]:
+    """Parse the JSON object in a free-form LLM response, or return None."""
+    response_text = response_text.strip()
+    logger.info(f"Raw LLM response: {repr(response_text)}")
+    
+    # Clean up response
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    
+    start = response_text.find('{')
+    end = response_text.rfind('}') + 1
+    if start < 0 or end <= start:
+        logger.warning(f"Could not extract JSON from response: {response_text[:100]}...")
+        return None
+    
+    try:
+        return _json_loads(response_text[start:end])
+    except json.JSONDecodeError:
+        logger.warning(f"Could not parse JSON from response: {response_text[:100]}...")
+        return None
+
+
+def _normalize_result(parsed: Any) -> Dict[str, Any]:
+    """Ensure a parsed LLM result has the required fields."""
+    if not isinstance(parsed, dict):
+        parsed = {"dates": [], "tags": []}
+    
+    if "dates" not in parsed:
+        parsed["dates"] = []
+    if "tags" not in parsed:
+        parsed["tags"] = []
+    
+    return parsed
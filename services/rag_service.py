@@ -1,40 +1,116 @@
 """Main RAG service orchestrating all components."""
 
 import os
+import re
+import functools
+import queue
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 from llama_index.core import SimpleDirectoryReader, Document
 from llama_index.core.settings import Settings
 
 from config.settings import load_config
+from database.answer_cache import AnswerCache
 from database.metadata_db import MetadataDatabase
+from models.file_metadata import FileMetadata
 from models.search_models import SearchResult, QueryAnalysis
 from services.document_processor import DocumentProcessor
-from services.query_parser import parse_query_with_llm
+from services.llm_cache import LLMCache
+from services.query_parser import parse_query_fast, parse_query_with_llm
+from services.semantic_cache import SemanticCache
 
 
 logger = logging.getLogger(__name__)
 
+# Words ignored when falling back to keyword content search
+_STOP_WORDS = frozenset({'what', 'is', 'are', 'the', 'how', 'when', 'where', 'who', 'why', 'about', 'find', 'search'})
+# Keyword candidates: alphanumeric runs of 3+ characters (punctuation is dropped)
+_TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+# Tokens that must match exactly for a semantic cache hit (numbers, month names, hashtags, filenames)
+_LITERAL_RE = re.compile(r'[\w.-]+\.md|#[\w/-]+|\d+|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*')
+
+# Fixed parts of the answer prompt; only the query and context are filled in per call
+_ANSWER_PROMPT_PREAMBLE = 'You are answering the user\'s question: "'
+_ANSWER_PROMPT_MIDDLE = """"
+
+The following documents contain relevant information. Each document's filename indicates the date of the activities described within it.
+
+For example:
+- "2025-01-02.md" contains activities from January 2, 2025
+- "2024-08-28.md" contains activities from August 28, 2024
+- Files dated 2025-01-XX represent activities from January 2025
+
+Documents:
+"""
+_ANSWER_PROMPT_TAIL = """
+
+Based on the activities and information in these dated documents, provide a comprehensive answer to the user's question. Focus on summarizing what was accomplished, planned, or discussed during the relevant time period."""
+
+
+@functools.lru_cache(maxsize=256)
+def _read_file_prefix(file_path: str, mtime_ns: int, length: int) -> str:
+    """Read the first `length` characters of a vault file.
+    
+    The mtime in the cache key drops entries for edited files.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read(length)
+
 
 class RAGService:
     """Main RAG service using RDBMS for exact matching."""
     
-    def __init__(self, config: Dict[str, Any]):
+    # Documents written to the database per insert_many call during ingest
+    INSERT_BATCH_SIZE = 500
+    
+    # Below this many files, starting loader processes costs more than it saves
+    PARALLEL_LOAD_MIN_FILES = 500
+    
+    # Threads extracting metadata and previews during ingest
+    METADATA_WORKERS = 8
+    
+    def __init__(self, config: Dict[str, Any], use_cache: bool = True):
         """Initialize RAG service.
         
         Args:
             config: Application configuration dictionary
+            use_cache: Set to False to disable all caches regardless of the config
         """
         self.config = config
         
         # Initialize components
         self.metadata_db = MetadataDatabase(config['paths']['metadata_db_path'])
-        self.document_processor = DocumentProcessor()
         
-        # Document storage
-        self.documents: List[Document] = []
+        # Exact-match cache of generated answers, keyed on the full prompt and
+        # stored in the metadata database so it survives restarts
+        cache_config = config.get('cache', {})
+        self.cache_enabled = use_cache and cache_config.get('enabled', True)
+        self.answer_cache = AnswerCache(
+            self.metadata_db, cache_config.get('llm_response_max_entries', 512)
+        )
+        self.response_cache = LLMCache(
+            self.answer_cache, ttl_seconds=cache_config.get('llm_response_ttl_seconds', 86400)
+        )
+        
+        # Near-duplicate queries reuse earlier search results; needs an embedding model
+        self.semantic_cache: Optional[SemanticCache] = None
+        if self.cache_enabled and config['models'].get('embed_model'):
+            try:
+                self.semantic_cache = SemanticCache(
+                    lambda text: Settings.embed_model.get_query_embedding(text),
+                    threshold=cache_config.get('semantic_threshold', 0.98),
+                    max_entries=cache_config.get('semantic_max_entries', 256)
+                )
+            except ImportError as e:
+                logger.warning(f"⚠️ Semantic query cache disabled: {e}")
+        
+        # Documents are streamed into the database, only their count is kept
+        self._n_documents = 0
         
         logger.info("🚀 RAG Service initialized (RDBMS-only)")
     
@@ -59,23 +135,20 @@ class RAGService:
                 required_exts=[".md"],
                 recursive=True
             )
-            self.documents = reader.load_data()
-            logger.info(f"📚 Loaded {len(self.documents)} documents")
+            workers = self._load_workers(len(reader.input_files))
+            if workers > 1:
+                documents = reader.load_data(num_workers=workers)
+            else:
+                # Read one file at a time so only the batch being stored is in memory
+                documents = chain.from_iterable(reader.iter_data())
             
-            # Process documents for RDBMS
-            for doc in self.documents:
-                # Extract metadata
-                metadata = self.document_processor.extract_file_metadata(doc)
-                
-                # Create content preview for RDBMS
-                content_preview = self.document_processor.create_content_preview(
-                    doc, self.config['search']['content_preview_length']
-                )
-                
-                # Store in metadata database
-                success = self.metadata_db.insert_file_metadata(metadata, content_preview)
-                if not success:
-                    logger.warning(f"⚠️ Failed to store metadata for: {metadata.filename}")
+            # Extract metadata on worker threads; a single writer thread stores it
+            self._n_documents = self._ingest_documents(documents)
+            logger.info(f"📚 Loaded {self._n_documents} documents")
+            
+            # Cached search results may no longer match the database
+            if self.semantic_cache is not None:
+                self.semantic_cache.clear()
             
             logger.info("✅ All documents processed successfully")
             return True
@@ -84,6 +157,113 @@ class RAGService:
             logger.error(f"❌ Error processing documents: {e}")
             return False
     
+    def _load_workers(self, file_count: int) -> int:
+        """Number of processes SimpleDirectoryReader should load files with.
+        
+        Args:
+            file_count: Number of files to load
+            
+        Returns:
+            Worker count (1 loads in-process)
+        """
+        workers = self.config['processing'].get('load_workers', 0)
+        if not workers:
+            if file_count < self.PARALLEL_LOAD_MIN_FILES:
+                return 1
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        return min(workers, os.cpu_count() or 1)
+    
+    def _prepare_document(self, doc: Document) -> Tuple[FileMetadata, str]:
+        """Extract the metadata and content preview stored for one document."""
+        metadata = DocumentProcessor.extract_file_metadata(doc)
+        content_preview = DocumentProcessor.create_content_preview(
+            doc, self.config['search']['content_preview_length']
+        )
+        return metadata, content_preview
+    
+    def _ingest_documents(self, documents: Iterable[Document]) -> int:
+        """Extract metadata concurrently and store it in a single bulk transaction.
+        
+        Worker threads feed a bounded queue that one writer thread drains in
+        batches, since all database writes go through a single connection.
+        Documents are consumed one batch at a time, so a streamed iterable is
+        never held in memory as a whole.
+        
+        Args:
+            documents: Documents to store
+            
+        Returns:
+            Number of documents processed
+            
+        Raises:
+            Exception: Whatever extraction or storage raised; nothing is committed then
+        """
+        items: queue.Queue = queue.Queue(maxsize=self.INSERT_BATCH_SIZE * 2)
+        aborted = threading.Event()
+        errors: List[Exception] = []
+        
+        writer = threading.Thread(
+            target=self._write_documents, args=(items, aborted, errors), name="metadata-writer"
+        )
+        writer.start()
+        count = 0
+        documents = iter(documents)
+        try:
+            with ThreadPoolExecutor(max_workers=self.METADATA_WORKERS) as pool:
+                while not errors:
+                    chunk = list(islice(documents, self.INSERT_BATCH_SIZE))
+                    if not chunk:
+                        break
+                    for item in pool.map(self._prepare_document, chunk):
+                        items.put(item)
+                    count += len(chunk)
+        except BaseException:
+            aborted.set()
+            raise
+        finally:
+            items.put(None)
+            writer.join()
+        
+        if errors:
+            raise errors[0]
+        return count
+    
+    def _write_documents(self, items: queue.Queue, aborted: threading.Event, errors: List[Exception]):
+        """Writer thread: store queued (metadata, preview) pairs until the None sentinel."""
+        item = ()
+        try:
+            # bulk_ingest holds the write lock, so it must be opened on this thread
+            with self.metadata_db.bulk_ingest():
+                batch = []
+                while True:
+                    item = items.get()
+                    if item is None:
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.INSERT_BATCH_SIZE:
+                        self._store_metadata_batch(batch)
+                        batch = []
+                
+                if aborted.is_set():
+                    raise RuntimeError("Document ingest aborted")
+                if batch:
+                    self._store_metadata_batch(batch)
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so producers never block on a full queue
+            while item is not None:
+                item = items.get()
+    
+    def _store_metadata_batch(self, batch: List[Tuple[FileMetadata, str]]):
+        """Store a batch of (metadata, preview) pairs, retrying one by one if the batch fails."""
+        if self.metadata_db.insert_many(batch):
+            return
+        
+        # A failed batch is rolled back as a whole; find and report the bad documents
+        for metadata, content_preview in batch:
+            if not self.metadata_db.insert_file_metadata(metadata, content_preview):
+                logger.warning(f"⚠️ Failed to store metadata for: {metadata.filename}")
+    
     def search(self, query: str) -> Dict[str, Any]:
         """Perform RDBMS search for exact matching.
         
@@ -95,11 +275,29 @@ class RAGService:
         """
         logger.info(f"🔍 RDBMS SEARCH: '{query}'")
         
-        # Parse query
-        llm_result = parse_query_with_llm(query)
+        # Parse query; bare dates, hashtags and filenames skip the LLM
+        llm_result = parse_query_fast(query)
+        
+        # Only queries that need the LLM parser go through the semantic cache;
+        # fast-path queries are cheap and differ from neighbours only in their literals
+        query_embedding = None
+        if llm_result is None and self.semantic_cache is not None:
+            literals = tuple(_LITERAL_RE.findall(query.lower()))
+            try:
+                query_embedding = self.semantic_cache.embed(query)
+                cached = self.semantic_cache.get(query_embedding, literals)
+                if cached is not None:
+                    logger.info(f"⚡ Reusing results of similar query: '{cached['query_analysis'].original_query}'")
+                    return cached
+            except Exception as e:
+                logger.warning(f"⚠️ Semantic cache lookup failed: {e}")
+        
+        if llm_result is None:
+            llm_result = parse_query_with_llm(query, use_cache=self.cache_enabled)
         analysis = QueryAnalysis.from_llm_result(query, llm_result)
         logger.info(f"📊 Query Analysis: {analysis.search_strategy.value}")
-        logger.debug(f"   Parsed: dates={analysis.parsed_query.dates}, tags={analysis.parsed_query.tags}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"   Parsed: dates={analysis.parsed_query.dates}, tags={analysis.parsed_query.tags}")
         
         # RDBMS Search (exact matching)
         rdbms_results = self._perform_rdbms_search(analysis)
@@ -112,6 +310,9 @@ class RAGService:
         }
         
         logger.info(f"📊 Total results: {results['total_results']}")
+        
+        if query_embedding is not None:
+            self.semantic_cache.set(query_embedding, results, literals)
         return results
     
     def generate_response(self, query: str, search_results: List[SearchResult]) -> str:
@@ -137,22 +338,20 @@ class RAGService:
             if not Settings.llm:
                 return f"Found {len(search_results)} documents but LLM not available for response generation"
                 
-            prompt = f"""You are answering the user's question: "{query}"
-
-The following documents contain relevant information. Each document's filename indicates the date of the activities described within it.
-
-For example:
-- "2025-01-02.md" contains activities from January 2, 2025
-- "2024-08-28.md" contains activities from August 28, 2024
-- Files dated 2025-01-XX represent activities from January 2025
-
-Documents:
-{context}
-
-Based on the activities and information in these dated documents, provide a comprehensive answer to the user's question. Focus on summarizing what was accomplished, planned, or discussed during the relevant time period."""
+            prompt = "".join((_ANSWER_PROMPT_PREAMBLE, query, _ANSWER_PROMPT_MIDDLE, context, _ANSWER_PROMPT_TAIL))
+            
+            if self.cache_enabled:
+                cache_key = self.response_cache.make_key(prompt)
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("⚡ Using cached response")
+                    return cached
             
             response = Settings.llm.complete(prompt)
-            return response.text.strip()
+            response_text = response.text.strip()
+            if self.cache_enabled:
+                self.response_cache.set(cache_key, response_text)
+            return response_text
             
         except Exception as e:
             logger.error(f"❌ Error generating response: {e}")
@@ -167,47 +366,37 @@ Based on the activities and information in these dated documents, provide a comp
         Returns:
             List of search results
         """
-        results = []
-        
-        # Search by dates
-        for date in analysis.parsed_query.dates:
-            date_results = self.metadata_db.search_by_date(date)
-            results.extend(date_results)
-            logger.debug(f"📅 Date '{date}': {len(date_results)} results")
-        
-        # Search by tags
-        for tag in analysis.parsed_query.tags:
-            tag_results = self.metadata_db.search_by_tags(tag)
-            results.extend(tag_results)
-            logger.debug(f"🏷️ Tag '{tag}': {len(tag_results)} results")
-        
-        # Search by filenames
-        for filename in analysis.parsed_query.filenames:
-            filename_results = self.metadata_db.search_by_filename(filename)
-            results.extend(filename_results)
-            logger.debug(f"📄 Filename '{filename}': {len(filename_results)} results")
-        
-        # If no structured results, perform content search
-        if not results and not analysis.parsed_query.has_structured_data:
-            # Extract keywords from original query for content search
+        # Queries with several kinds of criteria (e.g. a date and a tag) return the
+        # union of per-criterion matches; search_multi ranks files matching every
+        # kind first, so no separate combined query is needed
+        results = self._search_per_criterion(analysis)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔎 Per-criterion search: {len(results)} results")
+        return results
+    
+    def _search_per_criterion(self, analysis: QueryAnalysis) -> List[SearchResult]:
+        """Search each date, tag and filename (or content keyword) and merge the results.
+        
+        Args:
+            analysis: Query analysis results
+            
+        Returns:
+            List of unique search results in per-criterion order
+        """
+        parsed = analysis.parsed_query
+        
+        if parsed.has_structured_data:
+            # Every date, tag and filename is searched by one UNION ALL query,
+            # which already returns each file once
+            unique_results = list(self.metadata_db.search_multi(parsed.dates, parsed.tags, parsed.filenames))
+        else:
+            # No structured criteria: search content for keywords from the original query
             content_query = analysis.original_query.strip()
             # Remove common query words
-            stop_words = {'what', 'is', 'are', 'the', 'how', 'when', 'where', 'who', 'why', 'about', 'find', 'search'}
-            keywords = [word for word in content_query.lower().split() if word not in stop_words and len(word) > 2]
-            
-            for keyword in keywords:
-                content_results = self.metadata_db.search_by_content(keyword)
-                results.extend(content_results)
-                logger.debug(f"📝 Content '{keyword}': {len(content_results)} results")
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_results = []
-        for result in results:
-            key = (result.filename, result.match_type.value)
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(result)
+            keywords = [word for word in _TOKEN_RE.findall(content_query.lower()) if word not in _STOP_WORDS]
+            # One full-text OR query returns each matching file once
+            unique_results = list(self.metadata_db.search_by_content_multi(keywords))
         
         return unique_results
     
@@ -223,18 +412,31 @@ Based on the activities and information in these dated documents, provide a comp
             Formatted context string
         """
         context_parts = []
-        max_docs = min(len(search_results), self.config['search']['max_rdbms_results'])
+        context_results = search_results[:self.config['search']['max_rdbms_results']]
+        
+        # Searches skip the preview column; fetch it in one query, only for documents that make the context
+        previews = self.metadata_db.get_previews([
+            result.file_path for result in context_results if not result.content and not result.content_preview
+        ])
         
-        for i, result in enumerate(search_results[:max_docs], 1):
+        for i, result in enumerate(context_results, 1):
+            if not result.content and not result.content_preview:
+                result.content_preview = previews.get(result.file_path) or ""
+            
             content = result.content or result.content_preview or "No content available"
             
             # Try to load full content if preview is insufficient
-            if len(content.strip()) < 50 and result.file_path and os.path.exists(result.file_path):
+            if len(content.strip()) < 50 and result.file_path:
                 try:
-                    with open(result.file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-                    content = file_content[:self.config['search']['content_preview_length']]
+                    # One stat both checks the file exists and keys the read cache
+                    content = _read_file_prefix(
+                        result.file_path,
+                        os.stat(result.file_path).st_mtime_ns,
+                        self.config['search']['content_preview_length']
+                    )
                     logger.debug(f"📂 Loaded full content for: {result.filename}")
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
                     logger.warning(f"⚠️ Could not load file {result.file_path}: {e}")
             
@@ -246,6 +448,11 @@ Based on the activities and information in these dated documents, provide a comp
         
         return "\n\n".join(context_parts)
     
+    def close(self):
+        """Release database resources."""
+        self.answer_cache.close()
+        self.metadata_db.close()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics.
         
@@ -253,8 +460,13 @@ Based on the activities and information in these dated documents, provide a comp
             Dictionary with system stats
         """
         return {
-            'documents_loaded': len(self.documents),
+            'documents_loaded': self._n_documents,
             'vault_path': self.config['paths']['vault_path'],
+            'answer_cache': {
+                'hits': self.response_cache.hits,
+                'misses': self.response_cache.misses,
+                **self.answer_cache.stats()
+            },
             'config': {
                 'max_rdbms_results': self.config['search']['max_rdbms_results'],
                 'content_preview_length': self.config['search']['content_preview_length']
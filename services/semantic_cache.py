@@ -0,0 +1,104 @@
+"""Semantic search cache: reuse results of near-identical earlier queries."""
+
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.98
+DEFAULT_MAX_ENTRIES = 256
+
+
+class SemanticCache:
+    """LRU cache of search results looked up by query embedding similarity.
+    
+    The threshold is deliberately high, but queries that differ only in a date
+    or tag still embed very close together. Each entry therefore also stores
+    the query's literal tokens (numbers, month names, hashtags, filenames) and a hit is only
+    accepted when they are identical.
+    """
+    
+    def __init__(self, embed_fn: Callable[[str], List[float]], threshold: float = DEFAULT_THRESHOLD,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+        
+        Args:
+            embed_fn: Function returning the embedding of a query string
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached queries
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if np is None:
+            raise ImportError("numpy is required for the semantic cache")
+        
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embeddings: List["np.ndarray"] = []
+        self._results: List[Dict[str, Any]] = []
+        self._literals: List[Tuple[str, ...]] = []
+        # Stacked, normalized embeddings; rebuilt lazily after changes
+        self._matrix: Optional["np.ndarray"] = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def embed(self, query: str) -> "np.ndarray":
+        """Return the normalized embedding of a query."""
+        vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, embedding: "np.ndarray", literals: Tuple[str, ...] = ()) -> Optional[Dict[str, Any]]:
+        """Return the closest cached result with the same literals, or None below the threshold."""
+        with self._lock:
+            if self._embeddings:
+                if self._matrix is None:
+                    self._matrix = np.stack(self._embeddings)
+                sims = self._matrix @ embedding
+                for i, entry_literals in enumerate(self._literals):
+                    if entry_literals != literals:
+                        sims[i] = -1.0
+                best = int(sims.argmax())
+                if sims[best] >= self.threshold:
+                    self.hits += 1
+                    self._touch(best)
+                    return self._results[-1]
+            self.misses += 1
+            return None
+    
+    def set(self, embedding: "np.ndarray", result: Dict[str, Any], literals: Tuple[str, ...] = ()):
+        """Store a result under a query embedding, evicting the least recently used entry."""
+        with self._lock:
+            self._embeddings.append(embedding)
+            self._results.append(result)
+            self._literals.append(literals)
+            if len(self._embeddings) > self.max_entries:
+                del self._embeddings[0]
+                del self._results[0]
+                del self._literals[0]
+            self._matrix = None
+    
+    def clear(self):
+        """Drop all entries, e.g. after the indexed documents change."""
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
+            self._literals.clear()
+            self._matrix = None
+    
+    def _touch(self, index: int):
+        """Move an entry to the most recently used position."""
+        if index != len(self._embeddings) - 1:
+            self._embeddings.append(self._embeddings.pop(index))
+            self._results.append(self._results.pop(index))
+            self._literals.append(self._literals.pop(index))
+            self._matrix = None
@@ -0,0 +1,66 @@
+"""Tests for the SQLite-backed answer cache."""
+
+import time
+
+import pytest
+
+from database.answer_cache import AnswerCache
+from database.metadata_db import MetadataDatabase
+
+
+@pytest.fixture
+def metadata_db(tmp_path):
+    database = MetadataDatabase(str(tmp_path / "metadata.db"))
+    yield database
+    database.close()
+
+
+def _stored_hits(metadata_db, key):
+    row = metadata_db.reader().execute(
+        'SELECT hit_count FROM llm_answer_cache WHERE prompt_sha = ?', (key,)
+    ).fetchone()
+    return row[0]
+
+
+def test_get_returns_stored_answer(metadata_db):
+    cache = AnswerCache(metadata_db)
+    cache.set("key", "answer", 0)
+    assert cache.get("key") == "answer"
+    assert cache.get("missing") is None
+
+
+def test_expired_answers_are_ignored(metadata_db):
+    cache = AnswerCache(metadata_db)
+    cache.set("key", "answer", 1)
+    time.sleep(1.1)
+    assert cache.get("key") is None
+
+
+def test_repeated_hits_on_one_key_are_flushed_by_count(metadata_db):
+    cache = AnswerCache(metadata_db)
+    cache.set("key", "answer", 0)
+    
+    for _ in range(AnswerCache.TOUCH_FLUSH_EVERY - 1):
+        cache.get("key")
+    assert _stored_hits(metadata_db, "key") == 0
+    
+    cache.get("key")
+    assert _stored_hits(metadata_db, "key") == AnswerCache.TOUCH_FLUSH_EVERY
+
+
+def test_close_flushes_buffered_hits(metadata_db):
+    cache = AnswerCache(metadata_db)
+    cache.set("key", "answer", 0)
+    cache.get("key")
+    cache.close()
+    assert _stored_hits(metadata_db, "key") == 1
+
+
+def test_entries_beyond_max_are_pruned_periodically(metadata_db):
+    cache = AnswerCache(metadata_db, max_entries=2)
+    for i in range(AnswerCache.PRUNE_EVERY):
+        cache.set(f"key{i}", "answer", 0)
+    
+    assert cache.stats()['entries'] == 2
+    # The most recently stored answers survive
+    assert cache.get(f"key{AnswerCache.PRUNE_EVERY - 1}") == "answer"
@@ -0,0 +1,39 @@
+"""Tests for parsing batched frontmatter responses."""
+
+import json
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from services.document_enricher import DocumentEnricher
+
+
+def _parse(entries, count=3):
+    by_id = DocumentEnricher._parse_batch_response(json.dumps({"results": entries}), count)
+    return {doc_id: entry["title"] for doc_id, entry in by_id.items()}
+
+
+def test_entries_are_matched_by_id():
+    entries = [{"id": 2, "title": "b"}, {"id": 1, "title": "a"}, {"id": 3, "title": "c"}]
+    assert _parse(entries) == {1: "a", 2: "b", 3: "c"}
+
+
+def test_off_by_one_ids_fall_back_to_position():
+    entries = [{"id": 0, "title": "a"}, {"id": 1, "title": "b"}, {"id": 2, "title": "c"}]
+    assert _parse(entries) == {1: "a", 2: "b", 3: "c"}
+
+
+def test_malformed_ids_are_skipped_per_entry():
+    entries = [{"id": "first", "title": "a"}, {"id": None, "title": "b"}, {"title": "c"}, {"id": 2, "title": "d"}]
+    assert _parse(entries) == {2: "d"}
+
+
+def test_malformed_ids_with_one_entry_per_document_use_position():
+    entries = [{"id": "first", "title": "a"}, {"id": [1], "title": "b"}, {"id": 3, "title": "c"}]
+    assert _parse(entries) == {1: "a", 2: "b", 3: "c"}
+
+
+def test_duplicate_and_out_of_range_ids_keep_first_valid_entry():
+    entries = [{"id": 1, "title": "a"}, {"id": 1, "title": "dup"}, {"id": 7, "title": "x"}, {"id": 2, "title": "b"}]
+    assert _parse(entries) == {1: "a", 2: "b"}
@@ -0,0 +1,131 @@
+"""Tests for the SQLite metadata database."""
+
+from datetime import datetime
+
+import pytest
+
+from database.metadata_db import MetadataDatabase
+from models.file_metadata import FileMetadata
+from models.search_models import MatchType
+
+
+def _file(name: str, date: str, tags):
+    return FileMetadata(
+        filename=name,
+        file_path=f"/vault/{name}",
+        creation_time=datetime(2025, 1, 1),
+        extracted_date=date,
+        tags=list(tags)
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = MetadataDatabase(str(tmp_path / "metadata.db"))
+    database.insert_many([
+        (_file("2025-01-03.md", "2025-01-03", ["work"]), "standup notes"),
+        (_file("2025-01-02b.md", "2025-01-02", ["home"]), "groceries"),
+        (_file("2025-01-02.md", "2025-01-02", ["work", "workout"]), "sprint planning"),
+    ])
+    yield database
+    database.close()
+
+
+def _names(results):
+    return [(result.filename, result.match_type) for result in results]
+
+
+def test_search_multi_single_kind_keeps_per_criterion_order(db):
+    assert _names(db.search_multi(dates=["2025-01"])) == [
+        ("2025-01-02.md", MatchType.DATE),
+        ("2025-01-02b.md", MatchType.DATE),
+        ("2025-01-03.md", MatchType.DATE),
+    ]
+
+
+def test_search_multi_returns_each_file_once(db):
+    # "work" matches both tags of 2025-01-02.md and is searched twice
+    results = list(db.search_multi(tags=["work", "work"]))
+    assert _names(results) == [
+        ("2025-01-02.md", MatchType.TAG),
+        ("2025-01-03.md", MatchType.TAG),
+    ]
+
+
+def test_search_multi_ranks_files_matching_every_kind_first(db):
+    # 2025-01-02.md matches the date and the tag; the others match only one of them
+    assert _names(db.search_multi(dates=["2025-01-02"], tags=["work"])) == [
+        ("2025-01-02.md", MatchType.DATE),
+        ("2025-01-02b.md", MatchType.DATE),
+        ("2025-01-03.md", MatchType.TAG),
+    ]
+
+
+def test_search_multi_without_criteria_returns_nothing(db):
+    assert list(db.search_multi()) == []
+
+
+def test_get_previews_fetches_many_files_in_one_call(db):
+    previews = db.get_previews(["/vault/2025-01-02.md", "/vault/2025-01-03.md", "/vault/missing.md"])
+    assert previews == {
+        "/vault/2025-01-02.md": "sprint planning",
+        "/vault/2025-01-03.md": "standup notes",
+    }
+    assert db.get_previews([]) == {}
+
+
+def test_insert_stores_each_tag_once_and_replaces_tags_on_update(db):
+    db.insert_file_metadata(_file("note.md", None, ["python", "python", "sql"]), "")
+    assert [r.filename for r in db.search_by_tags("python")] == ["note.md"]
+    
+    db.insert_file_metadata(_file("note.md", None, ["rust"]), "")
+    assert list(db.search_by_tags("python")) == []
+    assert [r.filename for r in db.search_by_tags("rust")] == ["note.md"]
+
+
+def test_fts_query_escapes_quotes_and_matches_prefixes():
+    assert MetadataDatabase._fts_query(' say "hi" ', 'filename') == 'filename : "say ""hi"""*'
+
+
+def test_filename_search_matches_prefix_and_tolerates_quotes(db):
+    names = [r.filename for r in db.search_by_filename("2025-01-0")]
+    # Shorter (closer) filenames rank first
+    assert sorted(names[:2]) == ["2025-01-02.md", "2025-01-03.md"]
+    assert names[2] == "2025-01-02b.md"
+    assert list(db.search_by_filename('odd "name')) == []
+
+
+def test_content_multi_ranks_files_matching_more_keywords_first(db):
+    db.insert_file_metadata(_file("plan.md", None, []), "sprint review and sprint planning")
+    results = [r.filename for r in db.search_by_content_multi(["sprint", "planning"])]
+    assert results[0] == "plan.md"
+    assert set(results) == {"plan.md", "2025-01-02.md"}
+
+
+def test_fts_index_follows_replaced_rows(db):
+    db.insert_file_metadata(_file("2025-01-03.md", "2025-01-03", ["work"]), "retrospective")
+    assert list(db.search_by_content_multi(["standup"])) == []
+    assert [r.filename for r in db.search_by_content_multi(["retro"])] == ["2025-01-03.md"]
+
+
+def test_bulk_ingest_rolls_back_only_the_failed_write(db):
+    with db.bulk_ingest():
+        assert db.insert_file_metadata(_file("good.md", None, ["ok"]), "")
+        # A non-string tag fails after the file row was written
+        assert not db.insert_file_metadata(_file("bad.md", None, [None]), "")
+        assert db.insert_file_metadata(_file("later.md", None, ["ok"]), "")
+    
+    assert db.get_previews(["/vault/bad.md"]) == {}
+    assert {r.filename for r in db.search_by_tags("ok")} == {"good.md", "later.md"}
+
+
+def test_bulk_ingest_discards_everything_when_the_block_raises(db):
+    with pytest.raises(RuntimeError):
+        with db.bulk_ingest():
+            db.insert_file_metadata(_file("discarded.md", None, ["gone"]), "")
+            raise RuntimeError("ingest aborted")
+    
+    assert list(db.search_by_tags("gone")) == []
+    # The connection is usable again afterwards
+    assert db.insert_file_metadata(_file("after.md", None, ["back"]), "")
+    assert [r.filename for r in db.search_by_tags("back")] == ["after.md"]
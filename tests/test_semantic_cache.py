@@ -0,0 +1,48 @@
+"""Tests for the embedding-similarity search cache."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.semantic_cache import SemanticCache
+
+
+# Fixed vectors stand in for an embedding model
+_EMBEDDINGS = {
+    "notes from 2025-01-02": [1.0, 0.0, 0.0],
+    "notes from 2025-01-03": [0.999, 0.01, 0.0],
+    "kubernetes": [0.0, 1.0, 0.0],
+    "docker": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(lambda text: _EMBEDDINGS[text], threshold=0.98, max_entries=2)
+
+
+def test_similar_query_with_same_literals_hits(cache):
+    cache.set(cache.embed("notes from 2025-01-02"), {"answer": 1}, ("2025", "01", "02"))
+    assert cache.get(cache.embed("notes from 2025-01-03"), ("2025", "01", "02")) == {"answer": 1}
+
+
+def test_similar_query_with_different_literals_misses(cache):
+    cache.set(cache.embed("notes from 2025-01-02"), {"answer": 1}, ("2025", "01", "02"))
+    assert cache.get(cache.embed("notes from 2025-01-03"), ("2025", "01", "03")) is None
+    assert cache.misses == 1
+
+
+def test_dissimilar_query_misses(cache):
+    cache.set(cache.embed("kubernetes"), {"answer": 1})
+    assert cache.get(cache.embed("docker")) is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.set(cache.embed("kubernetes"), {"answer": "k8s"})
+    cache.set(cache.embed("docker"), {"answer": "docker"})
+    # Touch kubernetes so docker becomes the oldest entry
+    assert cache.get(cache.embed("kubernetes")) == {"answer": "k8s"}
+    cache.set(cache.embed("notes from 2025-01-02"), {"answer": "notes"})
+    
+    assert cache.get(cache.embed("docker")) is None
+    assert cache.get(cache.embed("kubernetes")) == {"answer": "k8s"}